@@ -1,5 +1,15 @@
+import heapq
+import itertools
+import pickle
+import tempfile
+from array import array
+
+
 # Клас для вузла однозв'язного списку
 class Node:
+    # __slots__ прибирає __dict__ у кожного вузла, що суттєво зменшує пам'ять
+    __slots__ = ("data", "next")
+
     def __init__(self, data):
         self.data = data  # дані вузла
         self.next = None  # посилання на наступний вузол
@@ -9,17 +19,69 @@ class Node:
 class LinkedList:
     def __init__(self):
         self.head = None  # початок списку
+        self.tail = None  # останній вузол (для додавання за O(1))
+        self.length = 0   # кількість вузлів у списку
+
+    def __len__(self):
+        return self.length
 
     def append(self, data):
-        """Додає елемент у кінець списку."""
+        """Додає елемент у кінець списку за O(1) завдяки посиланню на хвіст."""
         new_node = Node(data)
         if self.head is None:
             self.head = new_node
         else:
-            current = self.head
-            while current.next:
-                current = current.next
-            current.next = new_node
+            self.tail.next = new_node
+        self.tail = new_node
+        self.length += 1
+
+    def extend(self, iterable):
+        """
+        Додає всі елементи послідовності в кінець списку за один прохід.
+        Вузли зв'язуються локально, а голова/хвіст оновлюються один раз у кінці.
+        """
+        dummy = Node(None)  # допоміжний вузол
+        tail = dummy
+        count = 0
+        for data in iterable:
+            tail.next = Node(data)
+            tail = tail.next
+            count += 1
+        if count == 0:
+            return
+        if self.head is None:
+            self.head = dummy.next
+        else:
+            self.tail.next = dummy.next
+        self.tail = tail
+        self.length += count
+
+    @classmethod
+    def from_iterable(cls, iterable):
+        """Створює новий список з елементів послідовності за O(n)."""
+        linked_list = cls()
+        linked_list.extend(iterable)
+        return linked_list
+
+    def _relink(self, head):
+        """
+        Встановлює нову голову списку та перераховує хвіст і довжину
+        (використовується після операцій, що переставляють вузли).
+        """
+        self.head = head
+        self.tail = None
+        self.length = 0
+        current = head
+        while current:
+            self.tail = current
+            self.length += 1
+            current = current.next
+
+    def __iter__(self):
+        current = self.head
+        while current:
+            yield current.data
+            current = current.next
 
     def print_list(self):
         """Виводить список на екран."""
@@ -29,10 +91,29 @@ class LinkedList:
             current = current.next
         print("None")
 
+    def remove(self, data):
+        """Видаляє перше входження значення; повертає True, якщо його знайдено."""
+        prev = None
+        current = self.head
+        while current:
+            if current.data == data:
+                if prev is None:
+                    self.head = current.next
+                else:
+                    prev.next = current.next
+                if current is self.tail:
+                    self.tail = prev
+                self.length -= 1
+                return True
+            prev = current
+            current = current.next
+        return False
+
     def reverse(self):
         """Реверсує список, змінюючи посилання між вузлами."""
         prev = None
         current = self.head
+        self.tail = current   # колишня голова стає хвостом
         while current:
             nxt = current.next    # зберігаємо наступний вузол
             current.next = prev   # змінюємо напрямок посилання
@@ -40,9 +121,12 @@ class LinkedList:
             current = nxt         # рухаємо current вперед
         self.head = prev
 
-    def sort(self):
-        """Сортує список за допомогою алгоритму злиття."""
-        self.head = merge_sort(self.head)
+    def sort(self, key=None, reverse=False):
+        """
+        Сортує список ітеративним (висхідним) сортуванням злиттям.
+        Сортування стабільне; key та reverse працюють як у вбудованому sorted().
+        """
+        self._relink(merge_sort_bottom_up(self.head, key=key, reverse=reverse))
 
 
 def merge_sorted_lists(l1, l2):
@@ -92,6 +176,140 @@ def merge_sort(head):
     return merge_sorted_lists(left, right)
 
 
+def _merge_runs(l1, l2, key, reverse):
+    """
+    Стабільно зливає два відсортовані ланцюжки вузлів.
+    При рівних ключах першим іде вузол з l1 (лівого ланцюжка).
+    Повертає голову результату.
+    """
+    dummy = Node(0)  # допоміжний вузол
+    tail = dummy
+    if key is None and not reverse:
+        # Найчастіший випадок – порівнюємо дані напряму, без виклику key
+        while l1 and l2:
+            if l2.data < l1.data:
+                tail.next = l2
+                l2 = l2.next
+            else:
+                tail.next = l1
+                l1 = l1.next
+            tail = tail.next
+        tail.next = l1 if l1 else l2
+        return dummy.next
+
+    if key is None:
+        key = _identity
+    k1 = key(l1.data)
+    k2 = key(l2.data)
+    while True:
+        # Вузол з l2 береться лише тоді, коли він строго "раніший" за вузол з l1
+        if (k1 < k2) if reverse else (k2 < k1):
+            tail.next = l2
+            tail = l2
+            l2 = l2.next
+            if l2 is None:
+                tail.next = l1
+                break
+            k2 = key(l2.data)
+        else:
+            tail.next = l1
+            tail = l1
+            l1 = l1.next
+            if l1 is None:
+                tail.next = l2
+                break
+            k1 = key(l1.data)
+    return dummy.next
+
+
+def _split_runs(head, key, reverse):
+    """
+    Розбиває список на природні відсортовані серії (як у TimSort).
+    Строго спадні (для reverse – строго зростаючі) серії розвертаються на місці,
+    тому вже відсортований або обернений вхід дає одну серію за O(n).
+    Генерує голови серій по черзі.
+    """
+    current = head
+    while current:
+        run_head = current
+        prev_key = key(current.data)
+        nxt = current.next
+        if nxt is not None:
+            nxt_key = key(nxt.data)
+            descending = (prev_key < nxt_key) if reverse else (nxt_key < prev_key)
+        else:
+            descending = False
+
+        if descending:
+            # Строго "неправильна" серія: розвертаємо її, зберігаючи стабільність
+            prev = None
+            while True:
+                nxt = current.next
+                current.next = prev
+                prev = current
+                current = nxt
+                if current is None:
+                    break
+                cur_key = key(current.data)
+                if not ((prev_key < cur_key) if reverse else (cur_key < prev_key)):
+                    break
+                prev_key = cur_key
+            yield prev
+        else:
+            # Неспадна (для reverse – незростаюча) серія
+            while True:
+                nxt = current.next
+                if nxt is None:
+                    current = None
+                    break
+                cur_key = key(nxt.data)
+                if (prev_key < cur_key) if reverse else (cur_key < prev_key):
+                    current.next = None  # відрізаємо серію
+                    current = nxt
+                    break
+                prev_key = cur_key
+                current = nxt
+            yield run_head
+
+
+def merge_sort_bottom_up(head, key=None, reverse=False):
+    """
+    Ітеративне сортування злиттям знизу вгору, без рекурсії.
+    Список ділиться на природні серії, які зливаються як двійковий лічильник:
+    bins[i] зберігає вже злиті 2**i серій (ширина 1, 2, 4, ...).
+    Такий порядок зливає щойно прочитані вузли, поки вони ще "гарячі" в кеші.
+    Сортування стабільне. Повертає голову відсортованого списку.
+    """
+    if head is None or head.next is None:
+        return head
+
+    bins = []  # bins[i] – відсортований ланцюжок з 2**i серій або None
+    for run in _split_runs(head, key or _identity, reverse):
+        i = 0
+        # Переносимо "одиницю" вгору: у bins[i] лежать раніші елементи,
+        # тому для стабільності вони йдуть лівим аргументом злиття
+        while i < len(bins) and bins[i] is not None:
+            run = _merge_runs(bins[i], run, key, reverse)
+            bins[i] = None
+            i += 1
+        if i == len(bins):
+            bins.append(run)
+        else:
+            bins[i] = run
+
+    # Зливаємо залишки: старші кошики містять раніші елементи
+    result = None
+    for run in bins:
+        if run is None:
+            continue
+        result = run if result is None else _merge_runs(run, result, key, reverse)
+    return result
+
+
+def _identity(value):
+    return value
+
+
 def merge_two_sorted_lists(list1, list2):
     """
     Об’єднує два відсортованих LinkedList в один відсортований список.
@@ -99,11 +317,525 @@ def merge_two_sorted_lists(list1, list2):
     """
     merged_list = LinkedList()
     merged_list.head = merge_sorted_lists(list1.head, list2.head)
+    # Хвіст об'єднаного списку – це хвіст того списку, чий останній елемент більший
+    if list1.tail is None:
+        merged_list.tail = list2.tail
+    elif list2.tail is None or list1.tail.data >= list2.tail.data:
+        merged_list.tail = list1.tail
+    else:
+        merged_list.tail = list2.tail
+    merged_list.length = list1.length + list2.length
+    return merged_list
+
+
+def _iter_merged_nodes(heads, key):
+    """
+    Генерує вузли з кількох відсортованих ланцюжків у порядку злиття.
+    Купа зберігає лише поточні голови: (ключ, номер_списку, вузол),
+    тому кожен крок коштує O(log k). Номер списку розв'язує нічиї на користь
+    раніших списків і гарантує, що самі вузли ніколи не порівнюються.
+    """
+    if key is None:
+        key = _identity
+    heap = [(key(node.data), index, node)
+            for index, node in enumerate(heads) if node is not None]
+    heapq.heapify(heap)
+    while heap:
+        _, index, node = heap[0]
+        nxt = node.next  # запам'ятовуємо до того, як вузол буде перезв'язано
+        if nxt is None:
+            heapq.heappop(heap)
+        else:
+            heapq.heapreplace(heap, (key(nxt.data), index, nxt))
+        yield node
+
+
+def merge_k_sorted_lists(lists, key=None):
+    """
+    Об’єднує k відсортованих LinkedList в один за O(n log k).
+    Вузли не копіюються, а перезв'язуються, тому вихідні списки
+    після виклику використовувати не слід. Рівні елементи зберігають
+    порядок вхідних списків. Повертає новий об’єкт LinkedList.
+    """
+    merged_list = LinkedList()
+    dummy = Node(None)  # допоміжний вузол
+    tail = dummy
+    count = 0
+    for node in _iter_merged_nodes([lst.head for lst in lists], key):
+        tail.next = node
+        tail = node
+        count += 1
+    tail.next = None
+    if count:
+        merged_list.head = dummy.next
+        merged_list.tail = tail
+        merged_list.length = count
+    return merged_list
+
+
+def iter_merge_k_sorted_lists(lists, key=None):
+    """
+    Ледачий варіант merge_k_sorted_lists: по одному генерує значення
+    у відсортованому порядку, не змінюючи вихідні списки і не будуючи нового.
+    """
+    for node in _iter_merged_nodes([lst.head for lst in lists], key):
+        yield node.data
+
+
+# Значення "немає вузла" для індексних посилань компактного списку
+NIL = -1
+
+
+# Компактний однозв'язний список на масивах
+class CompactLinkedList:
+    """
+    Однозв'язний список з тим самим API, що й LinkedList, але без об'єктів Node.
+    Вузол – це індекс i: значення лежить у _values[i], а індекс наступного
+    вузла – у _next[i] (масив array цілих чисел). Звільнені слоти утворюють
+    вільний список (також через _next) і повторно використовуються при append.
+    """
+
+    def __init__(self):
+        self._values = []         # значення вузлів
+        self._next = array("q")   # індекси наступних вузлів
+        self._free = NIL          # голова списку вільних слотів
+        self.head = NIL           # індекс першого вузла
+        self.tail = NIL           # індекс останнього вузла
+        self.length = 0           # кількість вузлів у списку
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        values = self._values
+        nxt = self._next
+        current = self.head
+        while current != NIL:
+            yield values[current]
+            current = nxt[current]
+
+    def _new_slot(self, data):
+        """Повертає індекс слота для нового вузла, беручи вільний, якщо він є."""
+        slot = self._free
+        if slot != NIL:
+            self._free = self._next[slot]
+            self._values[slot] = data
+            self._next[slot] = NIL
+            return slot
+        self._values.append(data)
+        self._next.append(NIL)
+        return len(self._values) - 1
+
+    def append(self, data):
+        """Додає елемент у кінець списку за O(1)."""
+        slot = self._new_slot(data)
+        if self.head == NIL:
+            self.head = slot
+        else:
+            self._next[self.tail] = slot
+        self.tail = slot
+        self.length += 1
+
+    def extend(self, iterable):
+        """Додає всі елементи послідовності в кінець списку."""
+        if self._free != NIL:
+            for data in iterable:
+                self.append(data)
+            return
+        # Без вільних слотів нові вузли лягають підряд: next[i] = i + 1
+        start = len(self._values)
+        self._values.extend(iterable)
+        end = len(self._values)
+        if end == start:
+            return
+        self._next.extend(range(start + 1, end + 1))
+        self._next[end - 1] = NIL
+        if self.head == NIL:
+            self.head = start
+        else:
+            self._next[self.tail] = start
+        self.tail = end - 1
+        self.length += end - start
+
+    @classmethod
+    def from_iterable(cls, iterable):
+        """Створює новий список з елементів послідовності за O(n)."""
+        compact_list = cls()
+        compact_list.extend(iterable)
+        return compact_list
+
+    def print_list(self):
+        """Виводить список на екран."""
+        for data in self:
+            print(data, end=" -> ")
+        print("None")
+
+    def remove(self, data):
+        """
+        Видаляє перше входження значення; повертає True, якщо його знайдено.
+        Звільнений слот додається до вільного списку.
+        """
+        values = self._values
+        nxt = self._next
+        prev = NIL
+        current = self.head
+        while current != NIL:
+            if values[current] == data:
+                if prev == NIL:
+                    self.head = nxt[current]
+                else:
+                    nxt[prev] = nxt[current]
+                if current == self.tail:
+                    self.tail = prev
+                values[current] = None  # не тримаємо посилання на видалене значення
+                nxt[current] = self._free
+                self._free = current
+                self.length -= 1
+                return True
+            prev = current
+            current = nxt[current]
+        return False
+
+    def reverse(self):
+        """Реверсує список, змінюючи індексні посилання між вузлами."""
+        nxt = self._next
+        prev = NIL
+        current = self.head
+        self.tail = current
+        while current != NIL:
+            following = nxt[current]
+            nxt[current] = prev
+            prev = current
+            current = following
+        self.head = prev
+
+    def sort(self, key=None, reverse=False):
+        """
+        Сортує список (стабільно; key та reverse – як у sorted()).
+        Значення впорядковуються вбудованим сортуванням і записуються назад
+        у суцільні слоти 0..n-1, тож заразом зникають "дірки" вільного списку.
+        """
+        ordered = sorted(self, key=key, reverse=reverse)
+        self._rebuild(ordered)
+
+    def _rebuild(self, ordered):
+        """Замінює вміст списку значеннями ordered, розкладеними підряд."""
+        self._values = ordered
+        n = len(ordered)
+        self._next = array("q", range(1, n + 1))
+        self._free = NIL
+        if n:
+            self._next[n - 1] = NIL
+            self.head, self.tail = 0, n - 1
+        else:
+            self.head = self.tail = NIL
+        self.length = n
+
+
+def merge_two_sorted_compact_lists(list1, list2, key=None):
+    """
+    Об’єднує два відсортованих CompactLinkedList в новий відсортований список.
+    При рівних ключах першими йдуть елементи list1.
+    """
+    merged_list = CompactLinkedList()
+    merged_list._rebuild(list(heapq.merge(list1, list2, key=key)))
+    return merged_list
+
+
+def merge_k_sorted_compact_lists(lists, key=None):
+    """Об’єднує k відсортованих CompactLinkedList за O(n log k)."""
+    merged_list = CompactLinkedList()
+    merged_list._rebuild(list(heapq.merge(*lists, key=key)))
     return merged_list
 
 
+def _spill_run(records, tmp_dir):
+    """Записує послідовність записів у тимчасовий файл і повертає його (на початку)."""
+    run_file = tempfile.TemporaryFile(dir=tmp_dir)
+    dump = pickle.Pickler(run_file, protocol=pickle.HIGHEST_PROTOCOL).dump
+    for record in records:
+        dump(record)
+    run_file.seek(0)
+    return run_file
+
+
+def _read_run(run_file):
+    """Генерує записи з файлу серії по одному, не завантажуючи його цілком."""
+    load = pickle.Unpickler(run_file).load
+    while True:
+        try:
+            yield load()
+        except EOFError:
+            return
+
+
+def external_sort(iterable, chunk_size=100_000, key=None, reverse=False,
+                  fan_in=64, tmp_dir=None):
+    """
+    Зовнішнє (потокове) сортування даних, що не вміщуються в пам'ять.
+
+    Вхід читається порціями по chunk_size записів; кожна порція сортується
+    зв'язним злиттям (merge_sort_bottom_up) і скидається у тимчасовий файл.
+    Потім серії зливаються k-шляховим злиттям і повертаються генератором.
+    Якщо серій більше за fan_in, вони попередньо зливаються групами,
+    щоб не тримати відкритими забагато файлів одночасно.
+    У пам'яті одночасно перебуває не більше chunk_size записів
+    (плюс по одному поточному запису з кожної серії під час злиття).
+    Сортування стабільне; key та reverse – як у sorted().
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size має бути додатним")
+    if fan_in < 2:
+        raise ValueError("fan_in має бути не меншим за 2")
+
+    runs = []
+    try:
+        iterator = iter(iterable)
+        while True:
+            chunk = LinkedList.from_iterable(itertools.islice(iterator, chunk_size))
+            if chunk.head is None:
+                break
+            chunk.sort(key=key, reverse=reverse)
+            runs.append(_spill_run(chunk, tmp_dir))
+            del chunk  # звільняємо вузли до читання наступної порції
+
+        # Багатопрохідне злиття, доки серій не стане не більше за fan_in
+        while len(runs) > fan_in:
+            merged_runs = []
+            for i in range(0, len(runs), fan_in):
+                group = runs[i:i + fan_in]
+                merged = heapq.merge(*(_read_run(f) for f in group),
+                                     key=key, reverse=reverse)
+                merged_runs.append(_spill_run(merged, tmp_dir))
+                for run_file in group:
+                    run_file.close()
+            runs = merged_runs
+
+        yield from heapq.merge(*(_read_run(f) for f in runs), key=key, reverse=reverse)
+    finally:
+        for run_file in runs:
+            run_file.close()
+
+
+def external_sort_file(path, chunk_size=100_000, key=None, reverse=False,
+                       fan_in=64, tmp_dir=None, encoding="utf-8"):
+    """
+    Зовнішнє сортування рядків текстового файлу (без символів кінця рядка).
+    Файл читається потоково, тож може бути більшим за доступну пам'ять.
+    """
+    with open(path, encoding=encoding) as source:
+        lines = (line.rstrip("\n") for line in source)
+        yield from external_sort(lines, chunk_size=chunk_size, key=key,
+                                 reverse=reverse, fan_in=fan_in, tmp_dir=tmp_dir)
+
+
+def check_external_sort(n=5_000, seed=0):
+    """
+    Порівнює external_sort з sorted() на вході, значно більшому за chunk_size:
+    одно- і багатопрохідне злиття (fan_in), key, reverse, стабільність,
+    дублікати, порожній вхід та external_sort_file.
+    """
+    import operator
+    import os
+    import random
+
+    rng = random.Random(seed)
+    numbers = [rng.randrange(n // 10) for _ in range(n)]  # багато дублікатів
+    # Записи з однаковими ключами: збіг із sorted() перевіряє і стабільність
+    records = [(rng.randrange(50), i) for i in range(n)]
+    by_key = operator.itemgetter(0)
+
+    for chunk_size, fan_in in ((37, 3), (37, 64), (n // 4, 2), (n * 2, 64)):
+        options = dict(chunk_size=chunk_size, fan_in=fan_in)
+        assert list(external_sort(numbers, **options)) == sorted(numbers)
+        assert list(external_sort(numbers, reverse=True, **options)) == \
+            sorted(numbers, reverse=True)
+        assert list(external_sort(records, key=by_key, **options)) == \
+            sorted(records, key=by_key)
+        assert list(external_sort(records, key=by_key, reverse=True, **options)) == \
+            sorted(records, key=by_key, reverse=True)
+    assert list(external_sort([], chunk_size=3)) == []
+
+    lines = [f"{rng.randrange(10**6):06d}" for _ in range(n)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "lines.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        assert list(external_sort_file(path, chunk_size=101, fan_in=4)) == sorted(lines)
+
+    for bad in (dict(chunk_size=0), dict(fan_in=1)):
+        try:
+            list(external_sort(numbers, **bad))
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"external_sort має відхиляти {bad}")
+    print(f"check_external_sort: {n} записів відсортовано так само, як sorted()")
+
+
+def benchmark_external_sort(n=500_000, chunk_sizes=(10_000, 50_000, 200_000)):
+    """
+    Сортує n записів з різними обмеженнями пам'яті (chunk_size значно менший за n),
+    перевіряє результат і порівнює пікову пам'ять з сортуванням у пам'яті.
+    """
+    import random
+    import time
+    import tracemalloc
+
+    print(f"{'chunk_size':>12} {'час, с':>8} {'пік пам., МБ':>14} {'коректно':>9}")
+    for chunk_size in chunk_sizes:
+        rng = random.Random(0)
+        stream = (rng.random() for _ in range(n))
+        tracemalloc.start()
+        start = time.perf_counter()
+        previous = float("-inf")
+        ordered = count = 0
+        for value in external_sort(stream, chunk_size=chunk_size):
+            ordered += value >= previous
+            previous = value
+            count += 1
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{chunk_size:>12} {elapsed:>8.2f} {peak / 2**20:>14.1f} "
+              f"{str(ordered == count == n):>9}")
+        assert ordered == count == n
+
+    rng = random.Random(0)
+    tracemalloc.start()
+    lst = LinkedList.from_iterable(rng.random() for _ in range(n))
+    lst.sort()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    label = "у пам'яті"
+    print(f"{label:>12} {'':>8} {peak / 2**20:>14.1f}")
+
+
+def benchmark_compact(n=1_000_000):
+    """
+    Порівнює LinkedList (вузли Node) і CompactLinkedList (масиви) на n елементах:
+    пікову пам'ять побудови, час побудови, обходу та сортування.
+    """
+    import random
+    import time
+    import tracemalloc
+
+    values = [random.random() for _ in range(n)]
+    print(f"{'список':>18} {'пам., МБ':>10} {'побудова, с':>12} {'обхід, с':>10} {'сортування, с':>14}")
+    for cls in (LinkedList, CompactLinkedList):
+        tracemalloc.start()
+        start = time.perf_counter()
+        lst = cls.from_iterable(values)
+        t_build = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        for _ in lst:
+            pass
+        t_iter = time.perf_counter() - start
+
+        start = time.perf_counter()
+        lst.sort()
+        t_sort = time.perf_counter() - start
+
+        print(f"{cls.__name__:>18} {peak / 2**20:>10.1f} {t_build:>12.3f} "
+              f"{t_iter:>10.3f} {t_sort:>14.3f}")
+
+
+def benchmark_merge_k(n=200_000, k_values=(2, 8, 32, 128, 512)):
+    """
+    Порівнює послідовне попарне злиття k списків (O(nk))
+    з купою merge_k_sorted_lists (O(n log k)).
+    """
+    import random
+    import time
+
+    print(f"{'k':>6} {'попарно, с':>12} {'купа, с':>10}")
+    for k in k_values:
+        shards = [sorted(random.sample(range(n * 10), n // k)) for _ in range(k)]
+
+        lists = [LinkedList.from_iterable(shard) for shard in shards]
+        start = time.perf_counter()
+        merged = lists[0]
+        for other in lists[1:]:
+            merged = merge_two_sorted_lists(merged, other)
+        t_pairwise = time.perf_counter() - start
+
+        lists = [LinkedList.from_iterable(shard) for shard in shards]
+        start = time.perf_counter()
+        merge_k_sorted_lists(lists)
+        t_heap = time.perf_counter() - start
+
+        print(f"{k:>6} {t_pairwise:>12.4f} {t_heap:>10.4f}")
+
+
+def benchmark_build(sizes=(10_000, 20_000, 40_000, 80_000, 160_000)):
+    """
+    Вимірює час побудови списку через append та from_iterable.
+    При лінійній складності час зростає пропорційно до n
+    (стовпчик "мкс/елемент" лишається приблизно сталим).
+    """
+    import time
+
+    print(f"{'n':>10} {'append, с':>12} {'from_iterable, с':>18} {'мкс/елемент':>13}")
+    for n in sizes:
+        start = time.perf_counter()
+        ll = LinkedList()
+        for value in range(n):
+            ll.append(value)
+        t_append = time.perf_counter() - start
+
+        start = time.perf_counter()
+        LinkedList.from_iterable(range(n))
+        t_bulk = time.perf_counter() - start
+
+        print(f"{n:>10} {t_append:>12.4f} {t_bulk:>18.4f} {t_append / n * 1e6:>13.3f}")
+
+
+def benchmark_sort(n=100_000, repeats=3):
+    """
+    Порівнює рекурсивний merge_sort з ітеративним merge_sort_bottom_up
+    на випадкових, відсортованих, обернених даних та даних з великою кількістю повторів.
+    """
+    import random
+    import time
+
+    inputs = {
+        "випадкові": random.sample(range(n), n),
+        "відсортовані": list(range(n)),
+        "обернені": list(range(n, 0, -1)),
+        "повтори": [random.randrange(10) for _ in range(n)],
+    }
+    print(f"{'вхід':>14} {'рекурсивний, с':>16} {'ітеративний, с':>16}")
+    for name, values in inputs.items():
+        timings = []
+        for sort_func in (merge_sort, merge_sort_bottom_up):
+            best = float("inf")
+            for _ in range(repeats):
+                head = LinkedList.from_iterable(values).head
+                start = time.perf_counter()
+                sort_func(head)
+                best = min(best, time.perf_counter() - start)
+            timings.append(best)
+        print(f"{name:>14} {timings[0]:>16.4f} {timings[1]:>16.4f}")
+
+
 # Приклад використання:
 if __name__ == "__main__":
+    import sys
+
+    if "--bench" in sys.argv:
+        benchmark_build()
+        benchmark_sort()
+        benchmark_merge_k()
+        benchmark_compact()
+        benchmark_external_sort()
+        sys.exit()
+    if "--check" in sys.argv:
+        check_external_sort()
+        sys.exit()
+
     # Створюємо однозв'язний список та додаємо елементи
     ll = LinkedList()
     for value in [3, 1, 5, 2, 4]:
@@ -138,3 +870,18 @@ if __name__ == "__main__":
     merged = merge_two_sorted_lists(ll1, ll2)
     print("Об'єднаний відсортований список:")
     merged.print_list()
+
+    # Об'єднуємо одразу кілька відсортованих списків через купу
+    shards = [LinkedList.from_iterable(values)
+              for values in ([1, 4, 7], [2, 5, 8], [3, 6, 9])]
+    print("Значення k-шляхового злиття:", list(iter_merge_k_sorted_lists(shards)))
+    merged_k = merge_k_sorted_lists(shards)
+    print("Об'єднаний список з k відсортованих:")
+    merged_k.print_list()
+
+    # Компактний варіант списку на масивах з тим самим API
+    compact = CompactLinkedList.from_iterable([3, 1, 5, 2, 4])
+    compact.reverse()
+    compact.sort()
+    print("Компактний список після реверсування та сортування:")
+    compact.print_list()
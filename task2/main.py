@@ -1,5 +1,261 @@
-import turtle
 import math
+import numpy as np
+
+# Черепашка потрібна лише для інтерактивного вікна; на серверах без Tk
+# дерево можна експортувати у SVG/PNG (див. export_tree)
+try:
+    import turtle
+except ImportError:
+    turtle = None
+
+def square_corners(x, y, s, angle):
+    """
+    Обчислює вершини квадрату A, B, C, D (проти годинникової стрілки).
+    A = (x, y) – нижній лівий кут, сторона AB має довжину s і напрямок angle (у градусах).
+    """
+    rad = math.radians(angle)
+    A = (x, y)
+    B = (x + s * math.cos(rad), y + s * math.sin(rad))
+    # Вектор, перпендикулярний до (cos(angle), sin(angle)), – це (-sin(angle), cos(angle)).
+    D = (x - s * math.sin(rad), y + s * math.cos(rad))
+    C = (B[0] - s * math.sin(rad), B[1] + s * math.cos(rad))
+    return A, B, C, D
+
+def _fill_levels(squares, xs, ys, sides, angles, theta, levels, first_level=0, offset=0,
+                 want_frontier=False):
+    """
+    Пошарово записує у squares вершини квадратів, починаючи з фронту (xs, ys, sides, angles)
+    на глобальному рівні first_level, де фронт займає позиції offset, offset+1, ... цього рівня.
+    Заповнює levels рівнів; на кожному наступному рівні нащадки фронту лежать суцільним
+    блоком, тож запис іде прямими зрізами. Кути – у радіанах.
+    Якщо want_frontier=True, повертає фронт нащадків останнього заповненого рівня.
+    """
+    theta_rad = math.radians(theta)
+    scale_left = math.cos(theta_rad)
+    scale_right = math.sin(theta_rad)
+    turn_left = theta_rad
+    turn_right = -(math.pi / 2 - theta_rad)
+
+    for depth in range(levels):
+        # Вектор сторони AB та перпендикулярний до нього вектор AD
+        ux = sides * np.cos(angles)
+        uy = sides * np.sin(angles)
+        row = 2 ** (first_level + depth) - 1 + offset * 2 ** depth
+        block = squares[row: row + xs.size]
+        block[:, 0, 0] = xs
+        block[:, 0, 1] = ys
+        block[:, 1, 0] = xs + ux
+        block[:, 1, 1] = ys + uy
+        block[:, 2, 0] = xs + ux - uy
+        block[:, 2, 1] = ys + uy + ux
+        block[:, 3, 0] = xs - uy
+        block[:, 3, 1] = ys + ux
+        if depth == levels - 1 and not want_frontier:
+            return None
+
+        # Наступний рівень: лівий нащадок стоїть на D, правий – на C
+        count = xs.size
+        next_xs = np.empty(2 * count)
+        next_ys = np.empty(2 * count)
+        next_sides = np.empty(2 * count)
+        next_angles = np.empty(2 * count)
+        next_xs[0::2] = block[:, 3, 0]
+        next_ys[0::2] = block[:, 3, 1]
+        next_xs[1::2] = block[:, 2, 0]
+        next_ys[1::2] = block[:, 2, 1]
+        next_sides[0::2] = sides * scale_left
+        next_sides[1::2] = sides * scale_right
+        next_angles[0::2] = angles + turn_left
+        next_angles[1::2] = angles + turn_right
+        xs, ys, sides, angles = next_xs, next_ys, next_sides, next_angles
+    return xs, ys, sides, angles
+
+def pythagoras_tree_squares(x, y, s, angle, theta, level):
+    """
+    Векторизована побудова геометрії дерева Піфагора без рекурсії.
+
+    Квадрати обчислюються пошарово (у ширину): кожен рівень – це кілька
+    операцій NumPy над масивами всіх квадратів цього рівня.
+    Повертає масив форми (N, 4, 2), N = 2**level - 1, де для кожного квадрату
+    записано вершини A, B, C, D. Квадрати рівня k займають рядки [2**k - 1, 2**(k+1) - 1),
+    а в межах рівня лівий нащадок i-го квадрату має індекс 2*i, правий – 2*i + 1.
+    """
+    if level <= 0:
+        return np.empty((0, 4, 2))
+
+    squares = np.empty((2 ** level - 1, 4, 2))
+    _fill_levels(squares, np.array([x], dtype=float), np.array([y], dtype=float),
+                 np.array([s], dtype=float), np.array([math.radians(angle)]), theta, level)
+    return squares
+
+def _subtree_worker(shm_name, total, frontier, theta, levels, first_level, offset):
+    """
+    Робоча функція процесу: підключається до спільної пам'яті за іменем
+    і записує в неї свої піддерева напряму, без передачі масивів назад.
+    """
+    from multiprocessing import shared_memory
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        squares = np.ndarray((total, 4, 2), dtype=np.float64, buffer=shm.buf)
+        _fill_levels(squares, *frontier, theta, levels, first_level, offset)
+        del squares  # звільняємо буфер перед закриттям
+    finally:
+        shm.close()
+
+def pythagoras_tree_squares_parallel(x, y, s, angle, theta, level, workers=None,
+                                     split_depth=None):
+    """
+    Паралельна версія pythagoras_tree_squares з ідентичним результатом.
+
+    Перші split_depth рівнів рахуються послідовно; фронт з 2**split_depth
+    незалежних піддерев ділиться на суцільні частини між процесами
+    ProcessPoolExecutor. Кожен процес записує свої рівні прямо у спільну пам'ять
+    (multiprocessing.shared_memory), тож великі масиви вершин не серіалізуються –
+    між процесами передаються лише кілька чисел фронту.
+    """
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if split_depth is None:
+        # Кілька частин на процес для рівномірного навантаження
+        split_depth = max(1, math.ceil(math.log2(workers * 4)))
+    if workers <= 1 or level <= split_depth:
+        return pythagoras_tree_squares(x, y, s, angle, theta, level)
+
+    total = 2 ** level - 1
+    shm = shared_memory.SharedMemory(create=True, size=total * 4 * 2 * 8)
+    try:
+        squares = np.ndarray((total, 4, 2), dtype=np.float64, buffer=shm.buf)
+        frontier = _fill_levels(squares, np.array([x], dtype=float), np.array([y], dtype=float),
+                                np.array([s], dtype=float), np.array([math.radians(angle)]),
+                                theta, split_depth, want_frontier=True)
+
+        width = 2 ** split_depth
+        chunks = min(width, workers * 4)
+        bounds = [width * i // chunks for i in range(chunks + 1)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_subtree_worker, shm.name, total,
+                            tuple(part[lo:hi] for part in frontier),
+                            theta, level - split_depth, split_depth, lo)
+                for lo, hi in zip(bounds, bounds[1:])
+            ]
+            for future in futures:
+                future.result()
+        result = squares.copy()
+        del squares
+    finally:
+        shm.close()
+        shm.unlink()
+    return result
+
+def pythagoras_tree_squares_recursive(x, y, s, angle, theta, level, out=None):
+    """
+    Рекурсивна (скалярна) побудова тієї ж геометрії, що й у draw_pythagoras_tree.
+    Повертає список кортежів вершин (A, B, C, D) у порядку обходу в глибину.
+    Використовується як еталон для порівняння з векторизованою версією.
+    """
+    if out is None:
+        out = []
+    if level == 0:
+        return out
+    A, B, C, D = square_corners(x, y, s, angle)
+    out.append((A, B, C, D))
+    pythagoras_tree_squares_recursive(D[0], D[1], s * math.cos(math.radians(theta)),
+                                      angle + theta, theta, level - 1, out)
+    pythagoras_tree_squares_recursive(C[0], C[1], s * math.sin(math.radians(theta)),
+                                      angle - (90 - theta), theta, level - 1, out)
+    return out
+
+def draw_squares(squares):
+    """Малює набір квадратів (масив (N, 4, 2) або список вершин) черепашкою."""
+    for A, B, C, D in squares:
+        turtle.penup()
+        turtle.goto(tuple(A))
+        turtle.pendown()
+        turtle.goto(tuple(B))
+        turtle.goto(tuple(C))
+        turtle.goto(tuple(D))
+        turtle.goto(tuple(A))
+
+def _subtree_radius(s, theta):
+    """
+    Радіус кола з центром у вершині A квадрату зі стороною s, яке гарантовано
+    містить увесь його підграф: від A до будь-якої точки нащадка не далі,
+    ніж сума діагоналей √2·s·(1 + q + q² + ...), де q = max(cos θ, sin θ).
+    """
+    q = max(math.cos(math.radians(theta)), math.sin(math.radians(theta)))
+    if q >= 1:
+        return math.inf
+    return math.sqrt(2) * s / (1 - q)
+
+def iter_pythagoras_tree(x, y, s, angle, theta, level, min_side=1.0, viewport=None,
+                         pixel_size=1.0, batch_size=4096):
+    """
+    Потоковий обхід дерева Піфагора з відсіканням невидимих гілок.
+
+    Параметри (крім параметрів draw_pythagoras_tree):
+      min_side   - мінімальна сторона квадрату в пікселях; менші квадрати
+                   та всі їхні нащадки (вони ще менші) не генеруються
+      viewport   - (xmin, ymin, xmax, ymax) у координатах дерева або None;
+                   піддерева, що гарантовано лежать поза ним, відкидаються
+      pixel_size - розмір одного пікселя в координатах дерева
+      batch_size - кількість квадратів в одній порції
+
+    Генерує масиви вершин форми (k, 4, 2), k <= batch_size.
+    Обхід іде в глибину з явним стеком, тому пам'ять обмежена O(level + batch_size)
+    і не залежить від кількості квадратів; час пропорційний кількості видимих квадратів.
+    """
+    if level <= 0:
+        return
+
+    theta_rad = math.radians(theta)
+    scale_left = math.cos(theta_rad)
+    scale_right = math.sin(theta_rad)
+    turn_left = theta_rad
+    turn_right = -(math.pi / 2 - theta_rad)
+    min_s = min_side * pixel_size
+    # Відношення радіусу кола-оболонки піддерева до сторони квадрату
+    radius_factor = _subtree_radius(1.0, theta)
+    if viewport is not None:
+        vx0, vy0, vx1, vy1 = viewport
+
+    batch = np.empty((batch_size, 4, 2))
+    count = 0
+    stack = [(x, y, s, math.radians(angle), level)]
+    while stack:
+        x, y, s, rad, depth = stack.pop()
+        if s < min_s:
+            continue
+        if viewport is not None:
+            # Відстань від A до прямокутника порівнюємо з радіусом оболонки
+            dx = max(vx0 - x, 0.0, x - vx1)
+            dy = max(vy0 - y, 0.0, y - vy1)
+            if dx * dx + dy * dy > (radius_factor * s) ** 2:
+                continue
+
+        ux = s * math.cos(rad)
+        uy = s * math.sin(rad)
+        square = batch[count]
+        square[0] = (x, y)
+        square[1] = (x + ux, y + uy)
+        square[2] = (x + ux - uy, y + uy + ux)
+        square[3] = (x - uy, y + ux)
+        count += 1
+        if count == batch_size:
+            yield batch.copy()
+            count = 0
+
+        if depth > 1:
+            # Правий нащадок кладемо першим, щоб лівий оброблявся раніше (як у рекурсії)
+            stack.append((x + ux - uy, y + uy + ux, s * scale_right, rad + turn_right, depth - 1))
+            stack.append((x - uy, y + ux, s * scale_left, rad + turn_left, depth - 1))
+    if count:
+        yield batch[:count].copy()
 
 def draw_pythagoras_tree(x, y, s, angle, theta, level):
     """
@@ -16,16 +272,9 @@ def draw_pythagoras_tree(x, y, s, angle, theta, level):
         return
 
     # Обчислюємо вершини квадрату.
-    # Нехай A = (x, y) – нижній лівий кут.
-    # Вектор AB має довжину s і напрямок angle:
-    rad = math.radians(angle)
-    A = (x, y)
-    B = (x + s * math.cos(rad), y + s * math.sin(rad))
-    # Щоб отримати перпендикулярну сторону, обчислюємо вектор, що є поворотом вектора AB на 90°:
-    # Вектор перпендикулярний до (cos(angle), sin(angle)) – це (-sin(angle), cos(angle)).
-    D = (x - s * math.sin(rad), y + s * math.cos(rad))
-    # Третя вершина – C, отримана як B плюс той самий перпендикулярний вектор:
-    C = (B[0] - s * math.sin(rad), B[1] + s * math.cos(rad))
+    # Нехай A = (x, y) – нижній лівий кут, вектор AB має довжину s і напрямок angle,
+    # D та C отримуємо зсувом A та B на перпендикулярний вектор.
+    A, B, C, D = square_corners(x, y, s, angle)
     
     # Малюємо квадрат (A -> B -> C -> D -> A)
     turtle.penup()
@@ -51,33 +300,298 @@ def draw_pythagoras_tree(x, y, s, angle, theta, level):
     new_angle_right = angle - (90 - theta)
     draw_pythagoras_tree(C[0], C[1], new_s_right, new_angle_right, theta, level - 1)
 
-def main():
+def _bounds(squares, margin=0.05):
+    """Повертає межі (xmin, ymin, xmax, ymax) набору квадратів з відносним відступом."""
+    if len(squares) == 0:
+        return 0.0, 0.0, 1.0, 1.0
+    xmin, ymin = squares.reshape(-1, 2).min(axis=0)
+    xmax, ymax = squares.reshape(-1, 2).max(axis=0)
+    pad = max(xmax - xmin, ymax - ymin) * margin
+    return xmin - pad, ymin - pad, xmax + pad, ymax + pad
+
+def _as_batches(squares, bounds):
+    """
+    Приводить вхід експорту до пари (порції, межі).
+    squares – масив (N, 4, 2) або ітерований потік таких масивів
+    (тоді межі потрібно передати явно, бо потік не можна переглянути двічі).
+    """
+    if isinstance(squares, np.ndarray):
+        squares = np.asarray(squares, dtype=float)
+        return [squares], bounds if bounds is not None else _bounds(squares)
+    if bounds is None:
+        raise ValueError("Для потоку квадратів потрібно передати bounds")
+    return squares, bounds
+
+def export_svg(squares, path, stroke="#2E7D32", fill="#A5D6A7", stroke_width=None,
+               bounds=None):
+    """
+    Записує квадрати (масив (N, 4, 2) або потік таких масивів) у SVG
+    одним елементом <path>; дані шляху дописуються у файл порціями.
+    Вісь y перевертається, бо в SVG вона спрямована донизу.
+    """
+    batches, (xmin, ymin, xmax, ymax) = _as_batches(squares, bounds)
+    width, height = xmax - xmin, ymax - ymin
+    if stroke_width is None:
+        stroke_width = max(width, height) / 2000
+
+    # Кожен квадрат форматується одним рядком-шаблоном: "M A L B L C L D Z"
+    template = "M{:.3f} {:.3f}L{:.3f} {:.3f}L{:.3f} {:.3f}L{:.3f} {:.3f}Z"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            '<svg xmlns="http://www.w3.org/2000/svg" '
+            f'viewBox="{xmin:.3f} {ymin:.3f} {width:.3f} {height:.3f}">\n'
+            '<path d="'
+        )
+        for batch in batches:
+            points = batch.copy()
+            points[:, :, 1] = ymax + ymin - points[:, :, 1]
+            f.write("".join(template.format(*row) for row in points.reshape(-1, 8).tolist()))
+        f.write(
+            f'" fill="{fill}" stroke="{stroke}" '
+            f'stroke-width="{stroke_width:.4f}" stroke-linejoin="round"/>\n'
+            "</svg>\n"
+        )
+
+def export_png(squares, path, size=1024, dpi=100, stroke="#2E7D32", fill="#A5D6A7",
+               bounds=None):
+    """
+    Растеризує квадрати у PNG без дисплея: усі багатокутники передаються
+    в matplotlib одним PolyCollection і малюються бекендом Agg за один виклик.
+    Для потоку порцій кожна порція стає окремою колекцією.
+    """
+    import matplotlib
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.collections import PolyCollection
+    from matplotlib.figure import Figure
+
+    batches, (xmin, ymin, xmax, ymax) = _as_batches(squares, bounds)
+    # Контур завтовшки пів пікселя (у пунктах), щоб дрібні гілки не зливалися
+    linewidth = 72 / dpi * 0.5
+
+    fig = Figure(figsize=(size / dpi, size / dpi), dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_axes((0, 0, 1, 1))
+    for batch in batches:
+        ax.add_collection(PolyCollection(batch, facecolors=fill, edgecolors=stroke,
+                                         linewidths=linewidth, antialiaseds=True))
+    ax.set_xlim(xmin, xmax)
+    ax.set_ylim(ymin, ymax)
+    ax.set_aspect("equal")
+    ax.axis("off")
+    with matplotlib.rc_context({"path.simplify": True}):
+        fig.savefig(path, dpi=dpi)
+
+def estimate_bounds(x, y, s, angle, theta, level, probe_level=12, tolerance=1e-3):
+    """
+    Оцінює межі всього дерева без побудови всіх квадратів.
+
+    Спершу будується неглибока копія до рівня probe_level. Піддерево під кожним
+    квадратом її нижнього рівня гарантовано лежить у колі радіусу _subtree_radius
+    навколо його вершини A; піддерева, чиї кола виходять за поточні межі,
+    розкриваються глибше, доки коло не стане меншим за tolerance від розміру
+    малюнка (тоді межі розширюються на саме коло). Тож межі ніколи не обрізають
+    глибокі рівні (при θ ≠ 45 вони виходять далеко за неглибоку копію), а
+    розкривається лише невелика частина квадратів біля краю.
+    """
+    probe = pythagoras_tree_squares(x, y, s, angle, theta, min(level, probe_level))
+    if level <= probe_level or len(probe) == 0:
+        return _bounds(probe)
+
+    theta_rad = math.radians(theta)
+    scale_left = math.cos(theta_rad)
+    scale_right = math.sin(theta_rad)
+    turn_right = -(math.pi / 2 - theta_rad)
+    radius_factor = _subtree_radius(1.0, theta)
+    xmin, ymin = probe.reshape(-1, 2).min(axis=0)
+    xmax, ymax = probe.reshape(-1, 2).max(axis=0)
+    min_radius = max(xmax - xmin, ymax - ymin) * tolerance
+
+    # Нащадки квадратів нижнього рівня копії: лівий стоїть на D, правий – на C
+    deepest = probe[2 ** (probe_level - 1) - 1:]
+    sides = np.hypot(*(deepest[:, 1] - deepest[:, 0]).T)
+    angles = np.arctan2(*(deepest[:, 1] - deepest[:, 0])[:, ::-1].T)
+    depth = level - probe_level
+    stack = list(zip(deepest[:, 3, 0], deepest[:, 3, 1], sides * scale_left,
+                     angles + theta_rad, [depth] * len(deepest)))
+    stack += zip(deepest[:, 2, 0], deepest[:, 2, 1], sides * scale_right,
+                 angles + turn_right, [depth] * len(deepest))
+    while stack:
+        x, y, s, rad, depth = stack.pop()
+        r = radius_factor * s if s > 0 else 0.0
+        if xmin <= x - r and x + r <= xmax and ymin <= y - r and y + r <= ymax:
+            continue
+        if r < min_radius:
+            xmin, ymin = min(xmin, x - r), min(ymin, y - r)
+            xmax, ymax = max(xmax, x + r), max(ymax, y + r)
+            continue
+
+        ux = s * math.cos(rad)
+        uy = s * math.sin(rad)
+        for px, py in ((x + ux, y + uy), (x + ux - uy, y + uy + ux), (x - uy, y + ux)):
+            xmin, ymin = min(xmin, px), min(ymin, py)
+            xmax, ymax = max(xmax, px), max(ymax, py)
+        if depth > 1:
+            stack.append((x + ux - uy, y + uy + ux, s * scale_right, rad + turn_right, depth - 1))
+            stack.append((x - uy, y + ux, s * scale_left, rad + theta_rad, depth - 1))
+
+    pad = max(xmax - xmin, ymax - ymin) * 0.05
+    return xmin - pad, ymin - pad, xmax + pad, ymax + pad
+
+def export_tree(path, level, theta=45, s=100, x=None, y=-250, base_angle=0, size=1024,
+                min_side=None, viewport=None, workers=1):
+    """
+    Будує дерево Піфагора заданого рівня та зберігає його у файл без вікна.
+    Формат визначається розширенням: .svg – векторний, .png – растровий.
+
+    Якщо задано min_side (у пікселях зображення) або viewport, дерево
+    обходиться потоково з відсіканням (iter_pythagoras_tree), тож можна
+    експортувати рівні 25+ з обмеженою пам'яттю. Інакше повна геометрія
+    будується у workers процесах (pythagoras_tree_squares_parallel).
+    """
+    if x is None:
+        x = -s / 2
+    suffix = path.lower().rsplit(".", 1)[-1]
+    if suffix not in ("svg", "png"):
+        raise ValueError(f"Непідтримуваний формат файлу: {path} (очікується .svg або .png)")
+
+    if min_side is None and viewport is None:
+        squares = pythagoras_tree_squares_parallel(x, y, s, base_angle, theta, level,
+                                                   workers=workers)
+        bounds = None
+    else:
+        bounds = viewport or estimate_bounds(x, y, s, base_angle, theta, level)
+        pixel_size = max(bounds[2] - bounds[0], bounds[3] - bounds[1]) / size
+        squares = iter_pythagoras_tree(x, y, s, base_angle, theta, level,
+                                       min_side=1.0 if min_side is None else min_side,
+                                       viewport=viewport, pixel_size=pixel_size)
+    if suffix == "svg":
+        export_svg(squares, path, bounds=bounds)
+    else:
+        export_png(squares, path, size=size, bounds=bounds)
+
+def main(level=None, theta=45):
+    if turtle is None:
+        raise RuntimeError("Модуль turtle (Tk) недоступний; використайте --out для експорту у файл")
+
     # Налаштування вікна та черепашки
     turtle.title("Фрактал: дерево Піфагора")
     turtle.speed(0)         # максимально швидко
     turtle.hideturtle()     # приховуємо черепашку для чистоти малюнку
     turtle.tracer(False)    # вимикаємо анімацію для пришвидшення малювання
     
-    # Запитуємо у користувача рівень рекурсії
-    level_input = turtle.numinput("Рівень рекурсії", 
-                                  "Введіть рівень рекурсії (наприклад, 5):", 
-                                  default=5, minval=0, maxval=15)
-    if level_input is None:
-        return
-    level = int(level_input)
+    # Запитуємо у користувача рівень рекурсії, якщо його не передано
+    if level is None:
+        level_input = turtle.numinput("Рівень рекурсії", 
+                                      "Введіть рівень рекурсії (наприклад, 5):", 
+                                      default=5, minval=0, maxval=30)
+        if level_input is None:
+            return
+        level = int(level_input)
     
     # Параметри базового квадрату:
     s = 100              # довжина сторони базового квадрату
     x = -s / 2           # нижній лівий кут: обираємо так, щоб квадрат був по центру по горизонталі
     y = -250             # нижнє положення (можна змінити за бажанням)
     base_angle = 0       # орієнтація базового квадрату: 0° → сторона направлена вправо
-    theta = 45           # кут розгалуження (розквіт), зазвичай 45°
+    # theta – кут розгалуження (розквіт), зазвичай 45°
     
-    # Побудова дерева Піфагора
-    draw_pythagoras_tree(x, y, s, base_angle, theta, level)
+    # Побудова дерева Піфагора: спочатку геометрія, потім малювання.
+    # Квадрати, менші за піксель, відкидаються – у вікні їх однаково не видно.
+    for batch in iter_pythagoras_tree(x, y, s, base_angle, theta, level, min_side=1.0):
+        draw_squares(batch)
     
     turtle.tracer(True)
     turtle.done()
 
+def benchmark_geometry(levels=range(10, 21)):
+    """
+    Порівнює час обчислення геометрії рекурсивною скалярною версією
+    та векторизованою пошаровою версією на NumPy.
+    """
+    import time
+
+    print(f"{'рівень':>7} {'квадратів':>10} {'рекурсивно, с':>15} {'NumPy, с':>10}")
+    for level in levels:
+        start = time.perf_counter()
+        pythagoras_tree_squares_recursive(-50, -250, 100, 0, 45, level)
+        t_recursive = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pythagoras_tree_squares(-50, -250, 100, 0, 45, level)
+        t_numpy = time.perf_counter() - start
+
+        print(f"{level:>7} {2 ** level - 1:>10} {t_recursive:>15.4f} {t_numpy:>10.4f}")
+
+def benchmark_parallel(level=22, worker_counts=(1, 2, 4, 8)):
+    """Масштабування паралельної побудови геометрії залежно від кількості процесів."""
+    import os
+    import time
+
+    print(f"рівень {level}, ядер: {os.cpu_count()}")
+    print(f"{'процесів':>9} {'час, с':>8} {'прискорення':>12}")
+    baseline = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        pythagoras_tree_squares_parallel(-50, -250, 100, 0, 45, level, workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>9} {elapsed:>8.3f} {baseline / elapsed:>12.2f}")
+
+def benchmark_lod(levels=(15, 20, 25, 30), min_side=1.0, size=1024):
+    """
+    Показує, що з відсіканням дрібних квадратів час і кількість квадратів
+    перестають рости з рівнем, а пікова пам'ять лишається сталою.
+    """
+    import time
+    import tracemalloc
+
+    x, y, s, angle, theta = -50, -250, 100, 0, 45
+    bounds = estimate_bounds(x, y, s, angle, theta, max(levels))
+    pixel_size = max(bounds[2] - bounds[0], bounds[3] - bounds[1]) / size
+    print(f"{'рівень':>7} {'видимих':>9} {'усього':>12} {'час, с':>8} {'пік пам., КБ':>13}")
+    for level in levels:
+        tracemalloc.start()
+        start = time.perf_counter()
+        visible = sum(len(batch) for batch in iter_pythagoras_tree(
+            x, y, s, angle, theta, level, min_side=min_side, pixel_size=pixel_size))
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{level:>7} {visible:>9} {2 ** level - 1:>12} {elapsed:>8.3f} {peak / 1024:>13.0f}")
+
 if __name__ == '__main__':
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Фрактал: дерево Піфагора")
+    parser.add_argument("--level", type=int, default=None,
+                        help="рівень рекурсії (без нього вікно запитає значення)")
+    parser.add_argument("--theta", type=float, default=45,
+                        help="кут розгалуження у градусах (за замовчуванням 45)")
+    parser.add_argument("--out", default=None,
+                        help="файл .svg або .png для експорту без вікна")
+    parser.add_argument("--size", type=int, default=1024,
+                        help="розмір PNG у пікселях (за замовчуванням 1024)")
+    parser.add_argument("--min-side", type=float, default=None,
+                        help="не малювати квадрати, менші за стільки пікселів")
+    parser.add_argument("--viewport", type=float, nargs=4, default=None,
+                        metavar=("XMIN", "YMIN", "XMAX", "YMAX"),
+                        help="малювати лише видиму область (у координатах дерева)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="кількість процесів для побудови повної геометрії")
+    parser.add_argument("--bench", action="store_true",
+                        help="запустити бенчмарк геометрії")
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark_geometry()
+        benchmark_lod()
+        benchmark_parallel()
+    elif args.out:
+        if not args.out.lower().endswith((".svg", ".png")):
+            parser.error("--out має закінчуватися на .svg або .png")
+        export_tree(args.out, args.level if args.level is not None else 10,
+                    theta=args.theta, size=args.size, min_side=args.min_side,
+                    viewport=tuple(args.viewport) if args.viewport else None,
+                    workers=args.workers)
+    else:
+        main(level=args.level, theta=args.theta)
@@ -1,14 +1,24 @@
+import ast
 import heapq
+import struct
+import sys
+from array import array
+from collections import OrderedDict
+from types import MappingProxyType
 
 def dijkstra(graph, start):
     """
     Алгоритм Дейкстри для знаходження найкоротших шляхів у зваженому графі.
 
     :param graph: Зважений граф, представлений у вигляді словника, де ключ – вершина,
-                  а значення – список кортежів (сусідня_вершина, вага_ребра)
+                  а значення – список кортежів (сусідня_вершина, вага_ребра),
+                  або CSRGraph (наприклад, завантажений через load_csr)
     :param start: Початкова вершина
     :return: Словник з найкоротшими відстанями від початкової вершини до кожної вершини графа
     """
+    if isinstance(graph, CSRGraph):
+        return graph.distances_to_dict(dijkstra_csr(graph, start))
+
     # Ініціалізуємо відстані до всіх вершин як нескінченність
     distances = {node: float('inf') for node in graph}
     distances[start] = 0  # Відстань до початкової вершини рівна нулю
@@ -34,7 +44,1068 @@ def dijkstra(graph, start):
     
     return distances
 
+def _build_path(predecessors, target):
+    """Відновлює шлях до target за словником попередників."""
+    path = []
+    while target is not None:
+        path.append(target)
+        target = predecessors[target]
+    path.reverse()
+    return path
+
+
+def reverse_graph(graph):
+    """
+    Будує граф з оберненими ребрами (потрібен для двонаправленого пошуку).
+    Для неорієнтованого графа результат збігається з вихідним.
+    """
+    reversed_graph = {node: [] for node in graph}
+    for node, edges in graph.items():
+        for neighbor, weight in edges:
+            reversed_graph.setdefault(neighbor, []).append((node, weight))
+    return reversed_graph
+
+
+def shortest_path(graph, source, target, method="dijkstra", heuristic=None,
+                  reversed_graph=None, stats=None):
+    """
+    Найкоротший шлях між двома вершинами.
+
+    :param graph: Граф у форматі словника {вершина: [(сусід, вага), ...]}
+    :param source: Початкова вершина
+    :param target: Кінцева вершина
+    :param method: "dijkstra" – Дейкстра з зупинкою, щойно target зафіксовано;
+                   "bidirectional" – двонаправлена Дейкстра;
+                   "astar" – A* з евристикою heuristic(вершина, target)
+    :param heuristic: Нижня оцінка відстані до цілі (для "astar"); без неї A* = Дейкстра
+    :param reversed_graph: Заздалегідь побудований reverse_graph(graph) для "bidirectional"
+    :param stats: Необов'язковий словник, у який записується кількість
+                  зафіксованих вершин під ключем "settled"
+    :return: Кортеж (відстань, шлях); якщо target недосяжна – (inf, [])
+    """
+    if method == "dijkstra":
+        result, settled = _astar(graph, source, target, None)
+    elif method == "astar":
+        result, settled = _astar(graph, source, target, heuristic)
+    elif method == "bidirectional":
+        if reversed_graph is None:
+            reversed_graph = reverse_graph(graph)
+        result, settled = _bidirectional_dijkstra(graph, reversed_graph, source, target)
+    else:
+        raise ValueError(f"Невідомий метод пошуку: {method}")
+    if stats is not None:
+        stats["settled"] = settled
+    return result
+
+
+def _astar(graph, source, target, heuristic):
+    """
+    A* (за heuristic=None – звичайна Дейкстра) з ранньою зупинкою на target.
+    Евристика має бути допустимою та монотонною, тоді кожна вершина
+    фіксується не більше одного разу. Повертає ((відстань, шлях), зафіксовано).
+    """
+    distances = {source: 0}
+    predecessors = {source: None}
+    settled = set()
+    priority_queue = [(heuristic(source, target) if heuristic else 0, 0, source)]
+
+    while priority_queue:
+        _, current_distance, current_node = heapq.heappop(priority_queue)
+        if current_node in settled:
+            continue
+        settled.add(current_node)
+        if current_node == target:
+            return (current_distance, _build_path(predecessors, target)), len(settled)
+
+        for neighbor, weight in graph.get(current_node, ()):
+            distance = current_distance + weight
+            if distance < distances.get(neighbor, float('inf')):
+                distances[neighbor] = distance
+                predecessors[neighbor] = current_node
+                estimate = distance + (heuristic(neighbor, target) if heuristic else 0)
+                heapq.heappush(priority_queue, (estimate, distance, neighbor))
+    return (float('inf'), []), len(settled)
+
+
+def _bidirectional_dijkstra(graph, reversed_graph, source, target):
+    """
+    Двонаправлена Дейкстра: пошук іде одночасно від source прямими ребрами
+    і від target оберненими; на кожному кроці розширюється менша черга.
+    Зупинка – коли сума вершин обох черг не менша за найкращий знайдений шлях.
+    Повертає ((відстань, шлях), зафіксовано).
+    """
+    if source == target:
+        return (0, [source]), 1
+
+    adjacency = (graph, reversed_graph)
+    distances = ({source: 0}, {target: 0})
+    predecessors = ({source: None}, {target: None})
+    settled = (set(), set())
+    queues = ([(0, source)], [(0, target)])
+    best, meeting = float('inf'), None
+
+    while queues[0] and queues[1]:
+        if queues[0][0][0] + queues[1][0][0] >= best:
+            break
+        side = 0 if len(queues[0]) <= len(queues[1]) else 1
+        current_distance, current_node = heapq.heappop(queues[side])
+        if current_node in settled[side]:
+            continue
+        settled[side].add(current_node)
+
+        other_distances = distances[1 - side]
+        for neighbor, weight in adjacency[side].get(current_node, ()):
+            distance = current_distance + weight
+            if distance < distances[side].get(neighbor, float('inf')):
+                distances[side][neighbor] = distance
+                predecessors[side][neighbor] = current_node
+                heapq.heappush(queues[side], (distance, neighbor))
+            # Перевіряємо, чи не з'єднує ребро два фронти коротшим шляхом
+            if neighbor in other_distances and distance + other_distances[neighbor] < best:
+                best = distance + other_distances[neighbor]
+                meeting = neighbor
+
+    settled_count = len(settled[0]) + len(settled[1])
+    if meeting is None:
+        return (float('inf'), []), settled_count
+    # Прямий шлях до точки зустрічі + обернений шлях від неї до target
+    path = _build_path(predecessors[0], meeting)
+    node = predecessors[1][meeting]
+    while node is not None:
+        path.append(node)
+        node = predecessors[1][node]
+    return (best, path), settled_count
+
+
+class _ShortestPathTree:
+    """Дерево найкоротших шляхів від одного джерела: відстані, попередники та нащадки."""
+
+    def __init__(self, graph, source):
+        self.source = source
+        self.distances = {node: float('inf') for node in graph}
+        self.distances[source] = 0
+        self.predecessors = {source: None}
+        self.children = {}
+        self.relax_from(graph, [(0, source)])
+
+    def set_parent(self, node, parent):
+        """Перевішує вершину на нового попередника, оновлюючи списки нащадків."""
+        old = self.predecessors.get(node)
+        if old is not None:
+            self.children[old].discard(node)
+        self.predecessors[node] = parent
+        if parent is not None:
+            self.children.setdefault(parent, set()).add(node)
+
+    def relax_from(self, graph, priority_queue, allowed=None):
+        """
+        Дейкстра з уже заповненої черги: поширює покращення відстаней.
+        Якщо задано allowed, оновлюються лише вершини з цієї множини.
+        Повертає кількість зафіксованих вершин (вартість роботи).
+        """
+        distances = self.distances
+        heapq.heapify(priority_queue)
+        settled = 0
+        while priority_queue:
+            current_distance, current_node = heapq.heappop(priority_queue)
+            if current_distance > distances.get(current_node, float('inf')):
+                continue
+            settled += 1
+            for neighbor, weight in graph.get(current_node, ()):
+                if allowed is not None and neighbor not in allowed:
+                    continue
+                distance = current_distance + weight
+                if distance < distances.get(neighbor, float('inf')):
+                    distances[neighbor] = distance
+                    self.set_parent(neighbor, current_node)
+                    heapq.heappush(priority_queue, (distance, neighbor))
+        return settled
+
+    def subtree(self, root):
+        """Усі вершини піддерева з коренем root (включно з ним)."""
+        nodes = {root}
+        stack = [root]
+        while stack:
+            for child in self.children.get(stack.pop(), ()):
+                nodes.add(child)
+                stack.append(child)
+        return nodes
+
+
+class ShortestPathIndex:
+    """
+    Кеш дерев найкоротших шляхів над графом у форматі словника
+    з інкрементним оновленням після зміни ваг ребер.
+
+    Для кожного запитаного джерела зберігається дерево найкоротших шляхів;
+    кеш обмежений max_size деревами і витісняє найдавніше використане (LRU).
+    update_edge не скидає кеш, а ремонтує кожне дерево локально:
+      - зменшення ваги поширює покращення від кінця ребра (як Дейкстра);
+      - збільшення ваги ребра дерева перераховує лише піддерево його кінця,
+        стартуючи з найкращих входів від незачеплених вершин.
+    Лічильники hits, misses, evictions, repairs та repair_settled
+    (кількість вершин, зафіксованих під час ремонтів) описують роботу кешу.
+    """
+
+    def __init__(self, graph, max_size=128):
+        if max_size < 1:
+            raise ValueError("max_size має бути додатним")
+        self.graph = graph
+        self.max_size = max_size
+        self._reversed = reverse_graph(graph)
+        self._trees = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.repairs = 0
+        self.repair_settled = 0
+
+    def _tree(self, source):
+        """Повертає дерево для джерела, будуючи його за потреби."""
+        tree = self._trees.get(source)
+        if tree is not None:
+            self.hits += 1
+            self._trees.move_to_end(source)
+            return tree
+        self.misses += 1
+        tree = _ShortestPathTree(self.graph, source)
+        self._trees[source] = tree
+        if len(self._trees) > self.max_size:
+            self._trees.popitem(last=False)
+            self.evictions += 1
+        return tree
+
+    def distances(self, source):
+        """Відстані від source до всіх вершин (незмінне відображення, як результат dijkstra)."""
+        return MappingProxyType(self._tree(source).distances)
+
+    def shortest_path(self, source, target):
+        """Повертає (відстань, шлях) від source до target; для недосяжної – (inf, [])."""
+        tree = self._tree(source)
+        distance = tree.distances.get(target, float('inf'))
+        if distance == float('inf'):
+            return distance, []
+        return distance, _build_path(tree.predecessors, target)
+
+    def update_edge(self, u, v, weight):
+        """
+        Встановлює вагу орієнтованого ребра u → v (додає ребро, якщо його немає)
+        та ремонтує всі закешовані дерева. Для неорієнтованого графа викликайте
+        також update_edge(v, u, weight).
+        """
+        new_nodes = [node for node in (u, v) if node not in self.graph]
+        old_weight = self._set_weight(self.graph, u, v, weight)
+        self._set_weight(self._reversed, v, u, weight)
+        # Нові вершини з'являються в кожному дереві як недосяжні, як у dijkstra
+        for tree in self._trees.values():
+            for node in new_nodes:
+                tree.distances.setdefault(node, float('inf'))
+        if old_weight == weight:
+            return
+        for tree in self._trees.values():
+            self.repairs += 1
+            if old_weight is None or weight < old_weight:
+                self.repair_settled += self._repair_decrease(tree, u, v, weight)
+            else:
+                self.repair_settled += self._repair_increase(tree, u, v)
+
+    @staticmethod
+    def _set_weight(graph, u, v, weight):
+        """Замінює вагу першого ребра u → v; повертає стару вагу або None."""
+        edges = graph.setdefault(u, [])
+        graph.setdefault(v, [])
+        for i, (neighbor, old_weight) in enumerate(edges):
+            if neighbor == v:
+                edges[i] = (v, weight)
+                return old_weight
+        edges.append((v, weight))
+        return None
+
+    def _repair_decrease(self, tree, u, v, weight):
+        """Ребро подешевшало: поширюємо покращення від v, якщо воно є."""
+        distances = tree.distances
+        distance = distances.get(u, float('inf')) + weight
+        if distance >= distances.get(v, float('inf')):
+            return 0
+        distances[v] = distance
+        tree.set_parent(v, u)
+        return tree.relax_from(self.graph, [(distance, v)])
+
+    def _repair_increase(self, tree, u, v):
+        """
+        Ребро подорожчало: якщо це ребро дерева, відстані вершин піддерева v
+        скидаються і перераховуються Дейкстрою в межах піддерева, починаючи
+        з найкращих ребер, що входять у нього з незачеплених вершин.
+        """
+        if tree.predecessors.get(v) != u:
+            return 0
+        distances = tree.distances
+        affected = tree.subtree(v)
+        for node in affected:
+            distances[node] = float('inf')
+
+        priority_queue = []
+        for node in affected:
+            best, parent = float('inf'), None
+            for neighbor, weight in self._reversed.get(node, ()):
+                distance = distances.get(neighbor, float('inf')) + weight
+                if neighbor not in affected and distance < best:
+                    best, parent = distance, neighbor
+            tree.set_parent(node, parent)
+            if parent is not None:
+                distances[node] = best
+                priority_queue.append((best, node))
+        return tree.relax_from(self.graph, priority_queue, allowed=affected)
+
+
+class CSRGraph:
+    """
+    Компактне представлення зваженого графа у форматі CSR (Compressed Sparse Row).
+
+    Мітки вершин відображаються у цілі ідентифікатори 0..n-1, а ребра зберігаються
+    у трьох суцільних масивах:
+      offsets - довжини n+1: ребра вершини u лежать у [offsets[u], offsets[u+1])
+      targets - ідентифікатори кінцевих вершин ребер
+      weights - ваги ребер
+    Це в рази економніше за словник списків кортежів і дружніше до кешу.
+
+    labels може бути списком або лінивою таблицею _LabelTable (load_csr);
+    словник index (мітка -> id) будується при першому зверненні.
+    """
+
+    def __init__(self, labels, offsets, targets, weights, path=None):
+        self.labels = labels      # id -> мітка
+        self._index = None        # мітка -> id, будується за потреби
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.path = path  # файл, з якого граф відображено в пам'ять (load_csr)
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = {label: i for i, label in enumerate(self.labels)}
+        return self._index
+
+    def __reduce__(self):
+        # Відображений з файлу граф передається іншим процесам як шлях:
+        # вони відкривають той самий файл і ділять сторінки лише для читання
+        if self.path is not None:
+            return load_csr, (self.path,)
+        return CSRGraph, (self.labels, self.offsets, self.targets, self.weights)
+
+    @classmethod
+    def from_dict(cls, graph):
+        """
+        Будує CSR-граф зі словника {вершина: [(сусід, вага), ...]}.
+        Вершини, що трапляються лише як сусіди, теж отримують ідентифікатори.
+        """
+        labels = list(graph)
+        index = {label: i for i, label in enumerate(labels)}
+        offsets = array("q", [0])
+        targets = array("i")
+        weights = array("d")
+        for label in graph:
+            for neighbor, weight in graph[label]:
+                target = index.get(neighbor)
+                if target is None:
+                    target = index[neighbor] = len(labels)
+                    labels.append(neighbor)
+                targets.append(target)
+                weights.append(weight)
+            offsets.append(len(targets))
+        # Вершини без власного списку суміжності мають порожній діапазон ребер
+        offsets.extend([len(targets)] * (len(labels) + 1 - len(offsets)))
+        csr = cls(labels, offsets, targets, weights)
+        csr._index = index
+        return csr
+
+    @property
+    def num_vertices(self):
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    def neighbors(self, label):
+        """Повертає список кортежів (сусід, вага) для вершини – як у форматі словника."""
+        u = self.index[label]
+        return [(self.labels[self.targets[e]], self.weights[e])
+                for e in range(self.offsets[u], self.offsets[u + 1])]
+
+    def nbytes(self):
+        """Розмір масивів ребер і зсувів у байтах (без таблиці міток)."""
+        return sum(len(a) * a.itemsize for a in (self.offsets, self.targets, self.weights))
+
+    def distances_to_dict(self, distances):
+        """Перетворює масив відстаней за id у словник {мітка: відстань}."""
+        return dict(zip(self.labels, distances))
+
+
+class _LabelTable:
+    """
+    Лінива таблиця міток графа з файлу CSR: мітка декодується лише при
+    зверненні до неї, тож відкриття файлу не залежить від кількості вершин.
+    blob – закодовані мітки одним блоком, offsets – межі міток у ньому.
+    """
+
+    def __init__(self, blob, offsets, literal=False):
+        self.blob = blob
+        self.offsets = offsets
+        self.literal = literal
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        text = bytes(self.blob[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+        return ast.literal_eval(text) if self.literal else text
+
+    def __iter__(self):
+        blob = bytes(self.blob)
+        offsets = self.offsets
+        for i in range(len(self)):
+            text = blob[offsets[i]:offsets[i + 1]].decode("utf-8")
+            yield ast.literal_eval(text) if self.literal else text
+
+
+# Заголовок бінарного файлу CSR: магічні байти, версія, кількість вершин,
+# кількість ребер, розмір таблиці міток у байтах (little-endian).
+# Версія 1 – мітки-рядки UTF-8, версія 2 – мітки як літерали Python (repr).
+_CSR_MAGIC = b"CSRG"
+_CSR_HEADER = struct.Struct("<4sIQQQ")
+_CSR_STR_LABELS = 1
+_CSR_LITERAL_LABELS = 2
+
+
+def _is_literal_label(label):
+    """Чи відновлюється мітка з repr через ast.literal_eval (числа, рядки, кортежі)."""
+    if isinstance(label, (str, int, float)) or label is None:
+        return True
+    return isinstance(label, tuple) and all(_is_literal_label(item) for item in label)
+
+
+def _padding(size):
+    """Кількість байтів вирівнювання до межі 8 байтів."""
+    return -size % 8
+
+
+def save_csr(csr, path):
+    """
+    Зберігає CSRGraph у компактний бінарний файл:
+    заголовок, offsets (int64), targets (int32), weights (float64),
+    зсуви міток (int64) та UTF-8 мітки одним блоком. Кожна секція вирівняна
+    на 8 байтів, тож load_csr може відобразити масиви з файлу без копіювання.
+    Мітки-рядки зберігаються як є; числа та кортежі (наприклад, вершини
+    grid_graph) – як repr і відновлюються при читанні з тим самим типом.
+    Інші типи міток не підтримуються (TypeError).
+    """
+    labels = list(csr.labels)
+    if all(isinstance(label, str) for label in labels):
+        version = _CSR_STR_LABELS
+        encoded = [label.encode("utf-8") for label in labels]
+    else:
+        for label in labels:
+            if not _is_literal_label(label):
+                raise TypeError(f"Мітку {label!r} не можна зберегти у файл CSR")
+        version = _CSR_LITERAL_LABELS
+        encoded = [repr(label).encode("utf-8") for label in labels]
+    label_offsets = array("q", [0])
+    total = 0
+    for item in encoded:
+        total += len(item)
+        label_offsets.append(total)
+
+    sections = (
+        array("q", csr.offsets),
+        array("i", csr.targets),
+        array("d", csr.weights),
+        label_offsets,
+    )
+    if sys.byteorder != "little":
+        for section in sections:
+            section.byteswap()
+    with open(path, "wb") as f:
+        f.write(_CSR_HEADER.pack(_CSR_MAGIC, version, csr.num_vertices, csr.num_edges, total))
+        for section in sections:
+            section.tofile(f)
+            f.write(b"\0" * _padding(len(section) * section.itemsize))
+        f.write(b"".join(encoded))
+
+
+def load_csr(path, use_mmap=True):
+    """
+    Відкриває граф, збережений save_csr.
+
+    За use_mmap=True масиви ребер не читаються, а відображаються з файлу
+    (mmap лише для читання): відкриття майже миттєве навіть для десятків
+    мільйонів ребер, сторінки підвантажуються ОС за потреби і спільні
+    для всіх процесів, що відкрили той самий файл. За use_mmap=False секції
+    копіюються у масиви array (такий граф можна серіалізувати pickle).
+
+    Мітки декодуються ліниво (_LabelTable); словник мітка -> id будується
+    при першому пошуку за міткою (наприклад, dijkstra(graph, "v0")) і коштує
+    O(n) – для мільйонів вершин це секунди. Робочі процеси dijkstra_many
+    отримують ідентифікатори джерел і таблицю міток не декодують.
+    """
+    import mmap
+
+    with open(path, "rb") as f:
+        if use_mmap:
+            buffer = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        else:
+            buffer = memoryview(f.read())
+
+    magic, version, n, m, labels_size = _CSR_HEADER.unpack_from(buffer)
+    if magic != _CSR_MAGIC or version not in (_CSR_STR_LABELS, _CSR_LITERAL_LABELS):
+        raise ValueError(f"{path}: це не файл графа CSR")
+    if sys.byteorder != "little":
+        raise ValueError("Формат CSR підтримується лише на little-endian платформах")
+
+    position = _CSR_HEADER.size
+    sections = []
+    for fmt, count in (("q", n + 1), ("i", m), ("d", m), ("q", n + 1)):
+        size = count * struct.calcsize(fmt)
+        section = buffer[position:position + size].cast(fmt)
+        if not use_mmap:
+            section = array(fmt, section)
+        sections.append(section)
+        position += size + _padding(size)
+    offsets, targets, weights, label_offsets = sections
+
+    blob = buffer[position:position + labels_size]
+    if not use_mmap:
+        blob = bytes(blob)
+    labels = _LabelTable(blob, label_offsets, literal=version == _CSR_LITERAL_LABELS)
+    return CSRGraph(labels, offsets, targets, weights, path=path if use_mmap else None)
+
+
+def load_edge_list_csv(path, delimiter=",", header=False, directed=True,
+                       chunk_size=65_536, encoding="utf-8"):
+    """
+    Потоково завантажує граф зі списку ребер у CSV: рядки "джерело,ціль,вага".
+
+    Файл читається порціями по chunk_size рядків; ребра одразу складаються
+    у компактні масиви, а наприкінці впорядковуються за джерелом підрахунком
+    (counting sort) у CSR за O(V + E) без проміжного словника.
+    Для directed=False кожне ребро додається в обидва боки.
+    """
+    import csv
+    import itertools
+
+    index = {}
+    labels = []
+    sources = array("i")
+    targets = array("i")
+    weights = array("d")
+
+    def vertex_id(label):
+        vertex = index.get(label)
+        if vertex is None:
+            vertex = index[label] = len(labels)
+            labels.append(label)
+        return vertex
+
+    with open(path, newline="", encoding=encoding) as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        if header:
+            next(reader, None)
+        while True:
+            chunk = list(itertools.islice(reader, chunk_size))
+            if not chunk:
+                break
+            chunk_sources = [vertex_id(row[0]) for row in chunk if row]
+            chunk_targets = [vertex_id(row[1]) for row in chunk if row]
+            chunk_weights = [float(row[2]) for row in chunk if row]
+            sources.extend(chunk_sources)
+            targets.extend(chunk_targets)
+            weights.extend(chunk_weights)
+            if not directed:
+                sources.extend(chunk_targets)
+                targets.extend(chunk_sources)
+                weights.extend(chunk_weights)
+
+    # Counting sort за джерелом: рахуємо степені, будуємо зсуви, розкладаємо ребра
+    n = len(labels)
+    offsets = array("q", [0]) * (n + 1)
+    for u in sources:
+        offsets[u + 1] += 1
+    for u in range(n):
+        offsets[u + 1] += offsets[u]
+    position = array("q", offsets[:-1])
+    csr_targets = array("i", [0]) * len(targets)
+    csr_weights = array("d", [0.0]) * len(weights)
+    for u, v, w in zip(sources, targets, weights):
+        e = position[u]
+        csr_targets[e] = v
+        csr_weights[e] = w
+        position[u] = e + 1
+    return CSRGraph(labels, offsets, csr_targets, csr_weights)
+
+
+def save_edge_list_csv(graph, path, delimiter=","):
+    """Записує граф у форматі словника як CSV зі списком ребер (джерело, ціль, вага)."""
+    import csv
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        for node, edges in graph.items():
+            writer.writerows((node, neighbor, weight) for neighbor, weight in edges)
+
+
+def dijkstra_csr(csr, start):
+    """
+    Алгоритм Дейкстри над CSRGraph.
+
+    :param csr: Граф у форматі CSRGraph
+    :param start: Мітка початкової вершини
+    :return: array('d') відстаней, індексований ідентифікаторами вершин
+             (мітку вершини i можна отримати як csr.labels[i])
+    """
+    return _dijkstra_csr_from(csr, csr.index[start])
+
+
+def _dijkstra_csr_from(csr, source):
+    """Дейкстра над CSRGraph від вершини з ідентифікатором source."""
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    distances = array("d", [float('inf')]) * csr.num_vertices
+    distances[source] = 0
+
+    priority_queue = [(0.0, source)]
+    heappop, heappush = heapq.heappop, heapq.heappush
+    while priority_queue:
+        current_distance, u = heappop(priority_queue)
+        if current_distance > distances[u]:
+            continue
+        for e in range(offsets[u], offsets[u + 1]):
+            distance = current_distance + weights[e]
+            v = targets[e]
+            if distance < distances[v]:
+                distances[v] = distance
+                heappush(priority_queue, (distance, v))
+    return distances
+
+
+# Граф, успадкований робочими процесами dijkstra_many (див. _init_worker)
+_worker_graph = None
+
+
+def _init_worker(csr):
+    """
+    Ініціалізатор процесу пулу: зберігає граф у глобальній змінній процесу.
+    За методу запуску fork граф успадковується без серіалізації,
+    за spawn – серіалізується один раз на процес, а не на кожне завдання.
+    """
+    global _worker_graph
+    _worker_graph = csr
+
+
+def _dijkstra_batch(sources):
+    """Рахує Дейкстру для порції пар (мітка, id) джерел у робочому процесі."""
+    return [(label, _dijkstra_csr_from(_worker_graph, source)) for label, source in sources]
+
+
+def dijkstra_many(graph, sources, workers=None, chunksize=None):
+    """
+    Алгоритм Дейкстри з багатьох джерел паралельно.
+
+    Граф один раз перетворюється на CSRGraph і передається процесам пулу
+    через ініціалізатор; завдання містять лише мітки та ідентифікатори джерел.
+    Результати генеруються в міру готовності (не обов'язково в порядку sources).
+
+    :param graph: Граф у форматі словника або CSRGraph
+    :param sources: Послідовність початкових вершин
+    :param workers: Кількість процесів (за замовчуванням – кількість ядер);
+                    1 – обчислення в поточному процесі без пулу
+    :param chunksize: Кількість джерел в одному завданні
+    :return: Генератор пар (джерело, відстані); для словника відстані – словник
+             {вершина: відстань}, як у dijkstra, для CSRGraph – масив, як у dijkstra_csr
+    """
+    import os
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    as_dict = not isinstance(graph, CSRGraph)
+    csr = CSRGraph.from_dict(graph) if as_dict else graph
+    sources = list(sources)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    def convert(batch):
+        for source, distances in batch:
+            yield source, csr.distances_to_dict(distances) if as_dict else distances
+
+    if workers <= 1 or len(sources) <= 1:
+        for source in sources:
+            yield from convert([(source, dijkstra_csr(csr, source))])
+        return
+
+    if chunksize is None:
+        # Кілька завдань на процес, щоб вирівняти навантаження
+        chunksize = max(1, len(sources) // (workers * 4))
+    tasks = [(source, csr.index[source]) for source in sources]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(csr,)) as pool:
+        futures = [pool.submit(_dijkstra_batch, tasks[i:i + chunksize])
+                   for i in range(0, len(sources), chunksize)]
+        for future in as_completed(futures):
+            yield from convert(future.result())
+
+
+def distance_matrix(graph, sources, workers=None, chunksize=None):
+    """
+    Матриця відстаней NumPy форми (len(sources), кількість вершин).
+    Рядок i відповідає sources[i], стовпець j – вершині csr.labels[j].
+    Повертає пару (матриця, мітки стовпців).
+    """
+    import numpy as np
+
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_dict(graph)
+    sources = list(sources)
+    row_of = {}
+    for row, source in enumerate(sources):
+        row_of.setdefault(source, []).append(row)
+    matrix = np.empty((len(sources), csr.num_vertices))
+    for source, distances in dijkstra_many(csr, row_of, workers=workers, chunksize=chunksize):
+        # array('d') підтримує буферний протокол – копіюємо без проміжних списків
+        matrix[row_of[source]] = np.frombuffer(distances, dtype=np.float64)
+    return matrix, csr.labels
+
+
+def random_graph(num_vertices, num_edges, max_weight=100, seed=0):
+    """
+    Генерує випадковий зважений орієнтований граф у форматі словника
+    з рядковими мітками вершин (як у прикладі нижче). Кожна вершина має
+    ребро до наступної, тож граф зв'язний.
+    """
+    import random
+
+    rng = random.Random(seed)
+    graph = {f"v{i}": [] for i in range(num_vertices)}
+    labels = list(graph)
+    for i, label in enumerate(labels):
+        graph[label].append((labels[(i + 1) % num_vertices], rng.randint(1, max_weight)))
+    for _ in range(num_edges - num_vertices):
+        u = labels[rng.randrange(num_vertices)]
+        graph[u].append((labels[rng.randrange(num_vertices)], rng.randint(1, max_weight)))
+    return graph
+
+
+def grid_graph(rows, cols, seed=0):
+    """
+    Генерує неорієнтований граф-решітку з вершинами (рядок, стовпець)
+    і вагами не меншими за 1 – зручна модель дорожньої мережі для A*.
+    """
+    import random
+
+    rng = random.Random(seed)
+    graph = {(r, c): [] for r in range(rows) for c in range(cols)}
+    for r in range(rows):
+        for c in range(cols):
+            for nr, nc in ((r + 1, c), (r, c + 1)):
+                if nr < rows and nc < cols:
+                    weight = rng.randint(1, 10)
+                    graph[(r, c)].append(((nr, nc), weight))
+                    graph[(nr, nc)].append(((r, c), weight))
+    return graph
+
+
+def manhattan(node, target):
+    """Допустима евристика для grid_graph: манхеттенська відстань (мінімальна вага 1)."""
+    return abs(node[0] - target[0]) + abs(node[1] - target[1])
+
+
+def benchmark_point_to_point(rows=300, cols=300, queries=20, seed=1):
+    """
+    Порівнює кількість зафіксованих вершин і час для запитів source→target:
+    повна Дейкстра, Дейкстра з ранньою зупинкою, двонаправлена та A*.
+    """
+    import random
+    import time
+
+    graph = grid_graph(rows, cols)
+    reversed_graph = reverse_graph(graph)
+    rng = random.Random(seed)
+    pairs = [((rng.randrange(rows), rng.randrange(cols)),
+              (rng.randrange(rows), rng.randrange(cols))) for _ in range(queries)]
+
+    print(f"решітка {rows}x{cols}, запитів: {queries} (середні значення)")
+    print(f"{'метод':>16} {'зафіксовано':>12} {'час, мс':>9}")
+    start = time.perf_counter()
+    for source, _ in pairs:
+        dijkstra(graph, source)
+    elapsed = (time.perf_counter() - start) / queries
+    print(f"{'повна Дейкстра':>16} {len(graph):>12} {elapsed * 1000:>9.1f}")
+
+    methods = (("dijkstra", {}), ("bidirectional", {"reversed_graph": reversed_graph}),
+               ("astar", {"heuristic": manhattan}))
+    reference = None
+    for method, options in methods:
+        settled = 0
+        lengths = []
+        start = time.perf_counter()
+        for source, target in pairs:
+            stats = {}
+            distance, _ = shortest_path(graph, source, target, method=method, stats=stats, **options)
+            settled += stats["settled"]
+            lengths.append(distance)
+        elapsed = (time.perf_counter() - start) / queries
+        reference = reference or lengths
+        assert lengths == reference
+        print(f"{method:>16} {settled // queries:>12} {elapsed * 1000:>9.1f}")
+
+
+def benchmark_many(num_vertices=20_000, num_edges=200_000, num_sources=32,
+                   worker_counts=(1, 2, 4, 8)):
+    """Масштабування dijkstra_many залежно від кількості процесів."""
+    import os
+    import time
+
+    csr = CSRGraph.from_dict(random_graph(num_vertices, num_edges))
+    sources = csr.labels[:num_sources]
+    print(f"джерел: {num_sources}, ребер: {num_edges}, ядер: {os.cpu_count()}")
+    print(f"{'процесів':>9} {'час, с':>8} {'прискорення':>12}")
+    baseline = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        for _ in dijkstra_many(csr, sources, workers=workers):
+            pass
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>9} {elapsed:>8.2f} {baseline / elapsed:>12.2f}")
+
+
+def benchmark_index(num_vertices=20_000, num_edges=100_000, num_sources=16,
+                    num_updates=200, seed=2):
+    """
+    Порівнює інкрементний ремонт ShortestPathIndex з повним перерахунком
+    dijkstra після кожної зміни ваги і перевіряє збіг відстаней.
+    """
+    import random
+    import time
+
+    rng = random.Random(seed)
+    graph = random_graph(num_vertices, num_edges, seed=seed)
+    sources = [f"v{rng.randrange(num_vertices)}" for _ in range(num_sources)]
+    index = ShortestPathIndex(graph, max_size=num_sources)
+    for source in sources:
+        index.distances(source)
+
+    edges = [(u, v) for u, adjacent in graph.items() for v, _ in adjacent]
+    start = time.perf_counter()
+    for _ in range(num_updates):
+        u, v = rng.choice(edges)
+        index.update_edge(u, v, rng.randint(1, 100))
+    t_repair = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fresh = {source: dijkstra(graph, source) for source in sources}
+    t_full = (time.perf_counter() - start) * num_updates
+    assert all(dict(index.distances(source)) == fresh[source] for source in sources)
+
+    print(f"джерел: {num_sources}, оновлень: {num_updates}")
+    print(f"ремонт: {t_repair:.2f} с, зафіксовано вершин: {index.repair_settled}")
+    print(f"повний перерахунок (оцінка): {t_full:.2f} с, "
+          f"вершин: {num_vertices * num_sources * num_updates}")
+    print(f"кеш: влучань {index.hits}, промахів {index.misses}")
+
+
+def check_index(trials=50, num_vertices=30, num_updates=40, seed=0):
+    """
+    Після кожного update_edge порівнює відстані всіх закешованих джерел
+    ShortestPathIndex зі свіжим dijkstra. Оновлення змінюють ваги наявних
+    ребер (у обидва боки), додають нові ребра та нові вершини.
+    """
+    import random
+
+    rng = random.Random(seed)
+    for trial in range(trials):
+        graph = random_graph(num_vertices, num_vertices * 3, max_weight=10, seed=trial)
+        sources = rng.sample(list(graph), 4)
+        index = ShortestPathIndex(graph, max_size=3)
+        for source in sources:
+            index.distances(source)
+        new_vertices = 0
+        for step in range(num_updates):
+            labels = list(graph)
+            kind = rng.random()
+            if kind < 0.5:
+                u = rng.choice([label for label in labels if graph[label]])
+                v = rng.choice(graph[u])[0]
+            elif kind < 0.8:
+                u, v = rng.choice(labels), rng.choice(labels)
+            else:
+                new_vertices += 1
+                new = f"new{new_vertices}"
+                u, v = (new, rng.choice(labels)) if rng.random() < 0.5 else (rng.choice(labels), new)
+            index.update_edge(u, v, rng.randint(1, 10))
+            for source in list(index._trees):
+                assert dict(index.distances(source)) == dijkstra(graph, source), (trial, step)
+            index.distances(rng.choice(sources))
+    print(f"check_index: {trials * num_updates} оновлень збігаються з dijkstra")
+
+
+def check_csr(num_vertices=200, num_edges=1_000):
+    """
+    Перевіряє повний цикл: CSV -> CSRGraph -> бінарний файл -> mmap/читання,
+    серіалізацію pickle (зокрема для dijkstra_many з методом spawn) та
+    збереження міток різних типів (рядки, числа, кортежі grid_graph).
+    """
+    import multiprocessing
+    import os
+    import pickle
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor
+
+    graph = random_graph(num_vertices, num_edges, seed=3)
+    expected = dijkstra(graph, "v0")
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "graph.csv")
+        bin_path = os.path.join(tmp, "graph.csr")
+        save_edge_list_csv(graph, csv_path)
+        csr = load_edge_list_csv(csv_path)
+        assert dijkstra(csr, "v0") == expected
+        save_csr(csr, bin_path)
+        for use_mmap in (True, False):
+            loaded = load_csr(bin_path, use_mmap=use_mmap)
+            assert list(loaded.labels) == list(csr.labels)
+            assert list(loaded.offsets) == list(csr.offsets)
+            assert list(loaded.targets) == list(csr.targets)
+            assert list(loaded.weights) == list(csr.weights)
+            assert dijkstra(loaded, "v0") == expected
+            assert loaded.neighbors("v1") == csr.neighbors("v1")
+            restored = pickle.loads(pickle.dumps(loaded))
+            assert dijkstra(restored, "v0") == expected
+            del restored, loaded
+
+        # Процеси spawn отримують граф лише через pickle
+        sources = ["v0", "v5", "v7"]
+        for use_mmap in (True, False):
+            loaded = load_csr(bin_path, use_mmap=use_mmap)
+            with ProcessPoolExecutor(max_workers=2, initializer=_init_worker,
+                                     initargs=(loaded,),
+                                     mp_context=multiprocessing.get_context("spawn")) as pool:
+                batch = pool.submit(_dijkstra_batch,
+                                    [(s, loaded.index[s]) for s in sources]).result()
+            for source, distances in batch:
+                assert loaded.distances_to_dict(distances) == dijkstra(graph, source)
+            del loaded
+
+        # Мітки-числа та кортежі зберігають свій тип
+        for labeled in (grid_graph(5, 6), {1: [(2, 1.5)], 2: [(3, 2)], 3: []},
+                        {"a": [((1, "b"), 1)], (1, "b"): [(2.5, 3)], 2.5: []}):
+            path = os.path.join(tmp, "labels.csr")
+            save_csr(CSRGraph.from_dict(labeled), path)
+            for use_mmap in (True, False):
+                loaded = load_csr(path, use_mmap=use_mmap)
+                start = next(iter(labeled))
+                assert dijkstra(loaded, start) == dijkstra(labeled, start)
+                del loaded
+        try:
+            save_csr(CSRGraph.from_dict({object(): []}), path)
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("save_csr має відхиляти мітки без літерального подання")
+    print("check_csr: CSV -> CSR -> файл -> mmap/читання -> pickle збігаються з dijkstra")
+
+
+def benchmark_load(num_vertices=100_000, num_edges=1_000_000):
+    """
+    Час підготовки графа до запитів: побудова з CSV, читання бінарного файлу
+    у пам'ять та відображення його через mmap.
+    """
+    import os
+    import tempfile
+    import time
+
+    graph = random_graph(num_vertices, num_edges)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "graph.csv")
+        bin_path = os.path.join(tmp, "graph.csr")
+        save_edge_list_csv(graph, csv_path)
+
+        start = time.perf_counter()
+        csr = load_edge_list_csv(csv_path)
+        t_csv = time.perf_counter() - start
+        save_csr(csr, bin_path)
+
+        start = time.perf_counter()
+        loaded = load_csr(bin_path, use_mmap=False)
+        t_read = time.perf_counter() - start
+
+        start = time.perf_counter()
+        mapped = load_csr(bin_path)
+        t_mmap = time.perf_counter() - start
+
+        assert dijkstra(mapped, "v0") == dijkstra(loaded, "v0") == dijkstra(graph, "v0")
+        print(f"ребер: {num_edges}, CSV: {os.path.getsize(csv_path) / 2**20:.1f} МБ, "
+              f"бінарний: {os.path.getsize(bin_path) / 2**20:.1f} МБ")
+        print(f"{'CSV':>10} {t_csv:>8.3f} с")
+        print(f"{'читання':>10} {t_read:>8.3f} с")
+        print(f"{'mmap':>10} {t_mmap:>8.3f} с")
+        del mapped, loaded
+
+
+def benchmark_csr(num_vertices=100_000, num_edges=1_000_000):
+    """
+    Порівнює пам'ять і час Дейкстри для словника списків кортежів та CSRGraph
+    на синтетичному графі з num_edges ребрами.
+    Пам'ять обох форматів рахується однаково – tracemalloc після побудови,
+    тобто разом із рядками міток; для CSR – також список labels і словник index.
+    """
+    import time
+    import tracemalloc
+
+    tracemalloc.start()
+    graph = random_graph(num_vertices, num_edges)
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # Окрема копія словника: після побудови CSR вона звільняється, і в пам'яті
+    # лишаються тільки мітки, labels, index та масиви CSR
+    tracemalloc.start()
+    source = random_graph(num_vertices, num_edges)
+    start = time.perf_counter()
+    csr = CSRGraph.from_dict(source)
+    t_build = time.perf_counter() - start
+    del source
+    csr_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    dict_distances = dijkstra(graph, "v0")
+    t_dict = time.perf_counter() - start
+
+    start = time.perf_counter()
+    csr_distances = dijkstra_csr(csr, "v0")
+    t_csr = time.perf_counter() - start
+
+    assert csr.distances_to_dict(csr_distances) == dict_distances
+    print(f"вершин: {num_vertices}, ребер: {num_edges}, побудова CSR: {t_build:.2f} с")
+    print(f"{'формат':>10} {'пам., МБ':>10} {'Дейкстра, с':>12}")
+    print(f"{'словник':>10} {dict_bytes / 2**20:>10.1f} {t_dict:>12.2f}")
+    print(f"{'CSR':>10} {csr_bytes / 2**20:>10.1f} {t_csr:>12.2f}")
+    print(f"(з них масиви ребер і зсувів CSR: {csr.nbytes() / 2**20:.1f} МБ)")
+
+
 if __name__ == '__main__':
+    if "--bench" in sys.argv:
+        benchmark_csr()
+        benchmark_point_to_point()
+        benchmark_many()
+        benchmark_index()
+        benchmark_load()
+        sys.exit()
+    if "--check" in sys.argv:
+        check_index()
+        check_csr()
+        sys.exit()
+
     # Приклад зваженого графа. Граф представлено у вигляді словника,
     # де ключ – вершина, а значення – список кортежів (сусідня_вершина, вага_ребра)
     graph = {
@@ -52,3 +1123,13 @@ if __name__ == '__main__':
     print("Найкоротші відстані від вершини '{}':".format(start_node))
     for vertex, distance in shortest_distances.items():
         print("Вершина {}: {}".format(vertex, distance))
+
+    # Той самий граф у компактному CSR-представленні
+    csr_graph = CSRGraph.from_dict(graph)
+    csr_distances = csr_graph.distances_to_dict(dijkstra_csr(csr_graph, start_node))
+    print("Відстані через CSR збігаються:", csr_distances == shortest_distances)
+
+    # Найкоротший маршрут між двома вершинами різними методами
+    for method in ("dijkstra", "bidirectional"):
+        distance, path = shortest_path(graph, 'A', 'F', method=method)
+        print("Шлях A → F ({}): {} (довжина {})".format(method, " → ".join(path), distance))
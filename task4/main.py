@@ -1,5 +1,7 @@
+import operator
 import uuid
 import networkx as nx
+import numpy as np
 import matplotlib.pyplot as plt
 
 # Клас вузла дерева з додатковими властивостями
@@ -10,12 +12,21 @@ class Node:
         self.val = key
         self.color = color  # Колір вузла
         self.id = str(uuid.uuid4())  # Унікальний ідентифікатор вузла
+        self.children = []  # Усі нащадки (для d-арних куп)
 
 # Функція для рекурсивного додавання ребер у граф (для візуалізації)
-def add_edges(graph, node, pos, x=0, y=0, layer=1):
+def add_edges(graph, node, pos, x=0, y=0, layer=1, arity=2):
     if node is not None:
         # Додаємо вузол до графу із збереженням кольору та мітки
         graph.add_node(node.id, color=node.color, label=node.val)
+        if arity != 2:
+            # d-арне дерево: j-й нащадок зсувається на (2j - (d-1)) / d**layer
+            for j, child in enumerate(node.children):
+                cx = x + (2 * j - (arity - 1)) / arity ** layer
+                graph.add_edge(node.id, child.id)
+                pos[child.id] = (cx, y - 1)
+                add_edges(graph, child, pos, x=cx, y=y - 1, layer=layer + 1, arity=arity)
+            return graph
         # Обробка лівого піддерева
         if node.left:
             graph.add_edge(node.id, node.left.id)
@@ -31,10 +42,10 @@ def add_edges(graph, node, pos, x=0, y=0, layer=1):
     return graph
 
 # Функція для малювання дерева за допомогою NetworkX та Matplotlib
-def draw_tree(tree_root):
+def draw_tree(tree_root, arity=2):
     tree = nx.DiGraph()
     pos = {tree_root.id: (0, 0)}  # Початкова позиція кореня
-    tree = add_edges(tree, tree_root, pos)
+    tree = add_edges(tree, tree_root, pos, arity=arity)
 
     # Отримання списку кольорів та міток для вузлів
     colors = [node[1]['color'] for node in tree.nodes(data=True)]
@@ -45,35 +56,696 @@ def draw_tree(tree_root):
     plt.show()
 
 # Функція для побудови бінарного дерева з купи (списку)
-def build_heap_tree(heap, index=0):
+def build_heap_tree(heap, index=0, arity=2):
     """
-    Рекурсивно будує бінарне дерево з елементів купи.
+    Рекурсивно будує дерево з елементів купи.
     heap  - список елементів купи (наприклад, [15, 10, 8, 5, 4, 2, 1])
     index - поточний індекс у списку (за замовчуванням 0 для кореня)
+    arity - кількість нащадків вузла (2 для бінарної купи)
     Для вузла з індексом i:
       лівий нащадок: 2*i + 1,
-      правий нащадок: 2*i + 2.
+      правий нащадок: 2*i + 2,
+      у d-арній купі нащадки: d*i + 1, ..., d*i + d.
     """
     if index >= len(heap):
         return None
     # Створюємо вузол з поточним значенням
     node = Node(heap[index])
-    # Рекурсивно будуємо ліве та праве піддерево
-    node.left = build_heap_tree(heap, 2 * index + 1)
-    node.right = build_heap_tree(heap, 2 * index + 2)
+    # Рекурсивно будуємо піддерева нащадків
+    for child_index in range(arity * index + 1, arity * index + arity + 1):
+        child = build_heap_tree(heap, child_index, arity)
+        if child is not None:
+            node.children.append(child)
+    if arity == 2:
+        node.left = node.children[0] if len(node.children) > 0 else None
+        node.right = node.children[1] if len(node.children) > 1 else None
     return node
 
+# Клас купи на плоскому списку
+class Heap:
+    """
+    d-арна купа (мін- або макс-) на плоскому списку data.
+
+    Для вузла з індексом i нащадки мають індекси d*i + 1, ..., d*i + d,
+    а батько – (i - 1) // d. Більша арність (4, 8) зменшує висоту дерева
+    та кількість переходів між рівнями, що краще для кешу при просіюванні вниз.
+
+    kind    - "min" (корінь – найменший елемент) або "max" (найбільший)
+    arity   - кількість нащадків вузла (d >= 2)
+    indexed - зберігати позицію кожного елемента (потрібно для decrease_key);
+              тоді елементи мають бути хешовані та унікальні
+    trace   - записувати журнал подій (див. start_trace) для анімації HeapReplay
+    """
+
+    def __init__(self, items=(), kind="min", arity=2, indexed=False, trace=False):
+        if kind not in ("min", "max"):
+            raise ValueError("kind має бути 'min' або 'max'")
+        if arity < 2:
+            raise ValueError("arity має бути не меншою за 2")
+        self.kind = kind
+        self.arity = arity
+        self.indexed = indexed
+        # Чи має елемент a стояти ближче до кореня, ніж b
+        self._before = operator.lt if kind == "min" else operator.gt
+        self.data = list(items)
+        self._pos = {} if indexed else None
+        self.events = None
+        self.heapify()
+        if trace:
+            self.start_trace()
+
+    def start_trace(self):
+        """
+        Починає запис журналу подій з поточного стану купи.
+        Знімок стану зберігається в trace_snapshot, а події в events:
+          ("op", назва)        - початок операції (push, pop, replace, ...)
+          ("set", i, значення) - у слот i записано значення (i == len – новий вузол)
+          ("swap", i, j)       - обмін слотів i та j під час просіювання
+          ("truncate", n)      - купа скоротилася до n елементів
+        """
+        self.trace_snapshot = list(self.data)
+        self.events = []
+
+    def __len__(self):
+        return len(self.data)
+
+    def __bool__(self):
+        return bool(self.data)
+
+    def heapify(self):
+        """Перебудовує купу з поточного вмісту data за O(n) (просіювання вниз знизу вгору)."""
+        data = self.data
+        if self.events is not None:
+            self.events.append(("op", "heapify"))
+        if self.indexed:
+            self._pos = {item: i for i, item in enumerate(data)}
+            if len(self._pos) != len(data):
+                raise ValueError("В індексованій купі елементи мають бути унікальними")
+        for i in range((len(data) - 2) // self.arity, -1, -1):
+            self._sift_down(i)
+
+    def peek(self):
+        """Повертає елемент з вершини купи, не видаляючи його."""
+        if not self.data:
+            raise IndexError("peek з порожньої купи")
+        return self.data[0]
+
+    def push(self, item):
+        """Додає елемент за O(log_d n)."""
+        if self.indexed:
+            if item in self._pos:
+                raise ValueError(f"Елемент {item!r} вже є в купі")
+            self._pos[item] = len(self.data)
+        if self.events is not None:
+            self.events += [("op", "push"), ("set", len(self.data), item)]
+        self.data.append(item)
+        self._sift_up(len(self.data) - 1)
+
+    def pop(self):
+        """Видаляє та повертає елемент з вершини купи за O(d log_d n)."""
+        data = self.data
+        if not data:
+            raise IndexError("pop з порожньої купи")
+        if self.events is not None:
+            self.events.append(("op", "pop"))
+            if len(data) > 1:
+                self.events.append(("set", 0, data[-1]))
+            self.events.append(("truncate", len(data) - 1))
+        last = data.pop()
+        if not data:
+            if self.indexed:
+                del self._pos[last]
+            return last
+        top = data[0]
+        data[0] = last
+        if self.indexed:
+            del self._pos[top]
+            self._pos[last] = 0
+        self._sift_down(0)
+        return top
+
+    def replace(self, item):
+        """Видаляє вершину та додає item за одне просіювання (як heapq.heapreplace)."""
+        data = self.data
+        if not data:
+            raise IndexError("replace у порожній купі")
+        top = data[0]
+        data[0] = item
+        if self.indexed:
+            del self._pos[top]
+            if item in self._pos:
+                data[0] = top
+                self._pos[top] = 0
+                raise ValueError(f"Елемент {item!r} вже є в купі")
+            self._pos[item] = 0
+        if self.events is not None:
+            self.events += [("op", "replace"), ("set", 0, item)]
+        self._sift_down(0)
+        return top
+
+    def decrease_key(self, item, new_item):
+        """
+        Замінює item на new_item з вищим пріоритетом (меншим для мін-купи,
+        більшим для макс-купи) та просіює його вгору за O(log_d n).
+        Потрібна купа з indexed=True.
+        """
+        if not self.indexed:
+            raise ValueError("decrease_key потребує Heap(..., indexed=True)")
+        index = self._pos.get(item)
+        if index is None:
+            raise KeyError(item)
+        if self._before(item, new_item):
+            raise ValueError("Новий ключ має пріоритет нижчий за поточний")
+        if new_item != item and new_item in self._pos:
+            raise ValueError(f"Елемент {new_item!r} вже є в купі")
+        del self._pos[item]
+        self._pos[new_item] = index
+        self.data[index] = new_item
+        if self.events is not None:
+            self.events += [("op", "decrease_key"), ("set", index, new_item)]
+        self._sift_up(index)
+
+    def _sift_up(self, index):
+        """Піднімає елемент, доки батько не стане пріоритетнішим."""
+        data, pos, arity, before = self.data, self._pos, self.arity, self._before
+        events = self.events
+        item = data[index]
+        while index > 0:
+            parent = (index - 1) // arity
+            parent_item = data[parent]
+            if not before(item, parent_item):
+                break
+            data[index] = parent_item
+            if pos is not None:
+                pos[parent_item] = index
+            if events is not None:
+                events.append(("swap", index, parent))
+            index = parent
+        data[index] = item
+        if pos is not None:
+            pos[item] = index
+
+    def _sift_down(self, index):
+        """Опускає елемент, міняючи його з найпріоритетнішим нащадком."""
+        data, pos, arity, before = self.data, self._pos, self.arity, self._before
+        events = self.events
+        size = len(data)
+        item = data[index]
+        while True:
+            first = arity * index + 1
+            if first >= size:
+                break
+            best = first
+            best_item = data[first]
+            for child in range(first + 1, min(first + arity, size)):
+                if before(data[child], best_item):
+                    best, best_item = child, data[child]
+            if not before(best_item, item):
+                break
+            data[index] = best_item
+            if pos is not None:
+                pos[best_item] = index
+            if events is not None:
+                events.append(("swap", index, best))
+            index = best
+        data[index] = item
+        if pos is not None:
+            pos[item] = index
+
 # Функція для візуалізації купи
-def draw_heap(heap):
+def draw_heap(heap, fast=False):
     """
-    Побудова та візуалізація бінарної купи.
-    heap - список елементів купи.
+    Побудова та візуалізація купи.
+    heap - список елементів бінарної купи або об'єкт Heap (будь-якої арності).
+    fast - малювати пакетно через draw_heap_fast (для великих куп)
     """
+    if fast:
+        draw_heap_fast(heap)
+        return
+    if isinstance(heap, Heap):
+        root = build_heap_tree(heap.data, arity=heap.arity)
+        draw_tree(root, arity=heap.arity)
+        return
     root = build_heap_tree(heap)
     draw_tree(root)
 
+# Векторизоване розміщення купи за індексами масиву (без Node, uuid та networkx)
+def heap_layout(n, arity=2):
+    """
+    Обчислює координати вузлів і ребра d-арної купи з n елементів у замкненій формі.
+    Вузол з індексом i на глибині k має номер у рівні p = i - (d**k - 1) / (d - 1)
+    і координати x = (2p + 1) / d**k - 1, y = -k (ті самі, що дає add_edges).
+    Повертає (positions, edges): масив (n, 2) координат і масив (n - 1, 2)
+    пар (батько, нащадок), де ідентифікатор вузла – його індекс у купі.
+    """
+    index = np.arange(n)
+    # Початкові індекси рівнів: 0, 1, 1 + d, 1 + d + d**2, ...
+    starts = [0]
+    while starts[-1] < n:
+        starts.append(starts[-1] * arity + 1)
+    starts = np.array(starts)
+    depth = np.searchsorted(starts, index, side="right") - 1
+    level_width = np.power(float(arity), depth)
+    positions = np.empty((n, 2))
+    positions[:, 0] = (2 * (index - starts[depth]) + 1) / level_width - 1
+    positions[:, 1] = -depth
+    children = index[1:]
+    edges = np.column_stack(((children - 1) // arity, children))
+    return positions, edges
+
+def draw_heap_fast(heap, colors="skyblue", ax=None, label_limit=255, show=True, capacity=None,
+                   arity=2):
+    """
+    Пакетна візуалізація купи за індексним розміщенням heap_layout:
+    усі ребра – одна лінія з розривами NaN між відрізками (один шлях Agg,
+    помітно швидше за LineCollection з окремим Path на кожне ребро),
+    усі вузли – один scatter.
+    Підписи значень додаються лише для невеликих куп (до label_limit вузлів).
+    heap   - список елементів бінарної купи або об'єкт Heap
+    colors - один колір або послідовність кольорів вузлів за індексами
+    capacity - розмір купи, під який розраховуються межі та розмір вузлів
+               (для анімацій, де купа ще зростатиме)
+    arity  - арність купи, заданої списком (для Heap береться heap.arity)
+    Повертає (fig, ax, scatter, labels) для подальшого оновлення.
+    """
+    values, arity = (heap.data, heap.arity) if isinstance(heap, Heap) else (heap, arity)
+    n = len(values)
+    positions, edges = heap_layout(max(n, capacity or 0), arity)
+    depth = int(-positions[:, 1].min()) if len(positions) else 0
+    positions, edges = positions[:n], edges[:max(n - 1, 0)]
+
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(8, 5))
+    else:
+        fig = ax.figure
+    segments = np.full((len(edges), 3, 2), np.nan)
+    segments[:, :2] = positions[edges]
+    segments = segments.reshape(-1, 2)
+    ax.plot(segments[:, 0], segments[:, 1], color="gray", linewidth=0.8, zorder=1)
+    # Розмір маркера зменшується зі зростанням кількості вузлів на нижньому рівні
+    size = max(4.0, min(1500.0, 60000.0 / arity ** depth))
+    labeled = max(n, capacity or 0) <= label_limit
+    scatter = ax.scatter(positions[:, 0], positions[:, 1], s=size, c=colors,
+                         edgecolors="black" if labeled else "none", zorder=2)
+    labels = []
+    if labeled:
+        labels = [ax.text(x, y, str(value), ha="center", va="center", fontsize=10, zorder=3)
+                  for (x, y), value in zip(positions.tolist(), values)]
+    ax.set_xlim(-1.05, 1.05)
+    ax.set_ylim(-depth - 0.5, 0.5)
+    ax.axis("off")
+    if show:
+        plt.show()
+    return fig, ax, scatter, labels
+
+class HeapReplay:
+    """
+    Покадрове відтворення журналу подій Heap (start_trace) з інкрементним малюванням.
+
+    Дерево малюється один раз (draw_heap_fast), після чого кадр оновлює лише
+    змінені вузли: фон береться з копії полотна (blitting), і для кожного
+    зміненого вузла прямокутник навколо нього (разом із ребром до батька для
+    доданих і вилучених вузлів) відновлюється з "чистого" фону без дерева.
+    У цьому прямокутнику з обрізанням по ньому заново малюються всі ребра,
+    вузли та підписи, що його торкаються, у тому ж порядку, що й draw_heap_fast,
+    тож кадр збігається з малюнком купи з нуля. Отриманий кадр стає новим фоном.
+    Підсвічування щойно обміняних вузлів і рядок стану малюються поверх без
+    збереження у фон. Тому вартість кадру залежить від розміру полотна та кількості
+    змінених вузлів, а не від розміру купи (окрім векторизованого пошуку сусідів).
+    """
+
+    def __init__(self, snapshot, events, arity=2, figure=None, color="skyblue",
+                 highlight="tomato", label_limit=255):
+        self.values = list(snapshot)
+        self.events = events
+        self.arity = arity
+        self.color = color
+        self.highlight = highlight
+
+        # Найбільший розмір купи за весь журнал – під нього розраховується розміщення
+        size = capacity = len(self.values)
+        for event in events:
+            if event[0] == "set" and event[1] == size:
+                size += 1
+            elif event[0] == "truncate":
+                size = event[1]
+            capacity = max(capacity, size)
+        self.positions, _ = heap_layout(capacity, arity)
+        self.parents = (np.arange(capacity) - 1) // arity
+
+        if figure is None:
+            figure = plt.figure(figsize=(8, 5))
+        ax = figure.add_subplot()
+        _, self.ax, self.scatter, self.labels = draw_heap_fast(
+            self.values, colors=color, ax=ax, label_limit=label_limit,
+            show=False, capacity=capacity, arity=arity)
+        self._tree_edges = ax.lines[-1]
+        self.figure = figure
+        self.canvas = figure.canvas
+        self.show_labels = capacity <= label_limit
+        marker_size = self.scatter.get_sizes()[0]
+
+        # Невеликі анімовані артисти з тими ж стилями, що й у draw_heap_fast:
+        # ребра, вузли та підпис для перемальовування змінених ділянок,
+        # підсвічування та рядок стану
+        self._edges, = ax.plot([], [], color=self._tree_edges.get_color(),
+                               linewidth=self._tree_edges.get_linewidth(), animated=True)
+        self._nodes = ax.scatter([], [], s=marker_size, animated=True,
+                                 edgecolors="black" if self.show_labels else "none")
+        self._label = ax.text(0, 0, "", ha="center", va="center", fontsize=10,
+                              animated=True)
+        self._glow = ax.scatter([], [], s=marker_size, facecolors="none", zorder=4,
+                                edgecolors=highlight, linewidths=3, animated=True)
+        self._status = ax.text(0.01, 0.99, "", transform=ax.transAxes, ha="left",
+                               va="top", fontsize=11, animated=True)
+        self.size = len(self.values)
+        self._operation = ""
+        self._background = None
+        self._empty = None
+
+    def start(self):
+        """Малює статичне дерево і запам'ятовує його як фон (а також фон без дерева)."""
+        tree = [self.scatter, self._tree_edges, *self.labels]
+        for artist in tree:
+            artist.set_visible(False)
+        self.canvas.draw()
+        self._empty = self.canvas.copy_from_bbox(self.figure.bbox)
+        for artist in tree:
+            artist.set_visible(True)
+        self.canvas.draw()
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+
+        # Координати вузлів у пікселях і радіус вузла з запасом на контур
+        # та згладжування – для пошуку всього, що торкається зміненої ділянки
+        self._pixels = self.ax.transData.transform(self.positions)
+        points = np.sqrt(self.scatter.get_sizes()[0]) / 2 + 2
+        self._radius = points * self.figure.dpi / 72 + 2
+
+    def _node_box(self, i, with_edge=False):
+        """Прямокутник (x0, y0, x1, y1) у пікселях навколо вузла i (і його ребра до батька)."""
+        (x, y), r = self._pixels[i], self._radius
+        box = [x - r, y - r, x + r, y + r]
+        if with_edge and i > 0:
+            px, py = self._pixels[self.parents[i]]
+            box = [min(box[0], px), min(box[1], py), max(box[2], px), max(box[3], py)]
+        return box
+
+    def _repaint(self, boxes):
+        """
+        Для кожного прямокутника: відновлює чистий фон і заново малює (з обрізанням)
+        усі ребра, вузли та підписи поточної купи, що його торкаються.
+        """
+        from matplotlib.transforms import Bbox
+
+        width, height = self.canvas.get_width_height()
+        pad = 3
+        for x0, y0, x1, y1 in boxes:
+            x0, y0 = max(int(np.floor(x0)), 0), max(int(np.floor(y0)), 0)
+            x1, y1 = min(int(np.ceil(x1)), width), min(int(np.ceil(y1)), height)
+            if x0 >= x1 or y0 >= y1:
+                continue
+            # Agg обрізає лінії, маркери й текст з різним округленням меж (до пікселя),
+            # тож малюємо в ділянці з запасом pad, а в кадр переносимо лише сам
+            # прямокутник – запас повертається з копії поточного кадру
+            inner = Bbox.from_extents(x0, y0, x1, y1)
+            x0, y0 = max(x0 - pad, 0), max(y0 - pad, 0)
+            x1, y1 = min(x1 + pad, width), min(y1 + pad, height)
+            outer = Bbox.from_extents(x0, y0, x1, y1)
+            saved = self.canvas.copy_from_bbox(outer)
+            # Регіон копії полотна адресується рядками від верхнього краю, межі
+            # включні: відновлюються рівно пікселі [x0, x1) x [y0, y1)
+            self.canvas.restore_region(self._empty,
+                                       bbox=(x0, height - y1, x1 - 1, height - y0 - 1),
+                                       xy=(0, 0))
+            # Маркери виходять за межу обрізання ще на піксель – звужуємо її
+            clip = Bbox.intersection(outer.padded(-1), self.ax.bbox)
+            if clip is not None:
+                self._draw_area(clip)
+            patch = self.canvas.copy_from_bbox(inner)
+            self.canvas.restore_region(saved)
+            self.canvas.restore_region(patch)
+
+    def _draw_area(self, clip):
+        """Малює ребра, вузли та підписи, що торкаються прямокутника clip, з обрізанням по ньому."""
+        draw = self.ax.draw_artist
+        x0, y0, x1, y1 = clip.extents
+        alive = self._pixels[:self.size]
+        r = self._radius
+
+        # Ребра до батьків, чиї відрізки (з запасом на товщину) перетинають ділянку
+        children = np.arange(1, self.size)
+        child, parent = alive[1:], alive[self.parents[1:self.size]]
+        lo, hi = np.minimum(child, parent) - 2, np.maximum(child, parent) + 2
+        hit = ((hi[:, 0] >= x0) & (lo[:, 0] <= x1) & (hi[:, 1] >= y0) & (lo[:, 1] <= y1))
+        children = children[hit]
+        if len(children):
+            segments = np.full((len(children), 3, 2), np.nan)
+            segments[:, 0] = self.positions[self.parents[children]]
+            segments[:, 1] = self.positions[children]
+            segments = segments.reshape(-1, 2)
+            self._edges.set_data(segments[:, 0], segments[:, 1])
+            self._edges.set_clip_box(clip)
+            draw(self._edges)
+
+        # Вузли – у порядку індексів, як у спільному scatter
+        nodes = np.nonzero((alive[:, 0] + r >= x0) & (alive[:, 0] - r <= x1)
+                           & (alive[:, 1] + r >= y0) & (alive[:, 1] - r <= y1))[0]
+        if not len(nodes):
+            return
+        self._nodes.set_offsets(self.positions[nodes])
+        # Один колір, як у draw_heap_fast: тоді Agg малює маркери тим самим
+        # способом (draw_markers), і контури збігаються до пікселя
+        self._nodes.set_facecolor(self.color)
+        self._nodes.set_clip_box(clip)
+        draw(self._nodes)
+        if self.show_labels:
+            # Підписи ax.text за замовчуванням не обрізаються
+            self._label.set_clip_on(True)
+            self._label.set_clip_box(clip)
+            for i in nodes:
+                self._label.set_position(self.positions[i])
+                self._label.set_text(str(self.values[i]))
+                draw(self._label)
+
+    def step(self, event):
+        """Застосовує одну подію журналу та перемальовує лише змінені ділянки."""
+        kind = event[0]
+        boxes, highlighted = [], []
+        self.canvas.restore_region(self._background)
+        if kind == "op":
+            self._operation = event[1]
+        elif kind == "set":
+            _, index, value = event
+            if index == self.size:
+                self.values.append(value)
+                self.size += 1
+                boxes = [self._node_box(index, with_edge=True)]
+            else:
+                self.values[index] = value
+                boxes = [self._node_box(index)]
+            highlighted = [index]
+        elif kind == "swap":
+            _, i, j = event
+            self.values[i], self.values[j] = self.values[j], self.values[i]
+            boxes = [self._node_box(i), self._node_box(j)]
+            highlighted = [i, j]
+        elif kind == "truncate":
+            removed = range(event[1], self.size)
+            boxes = [self._node_box(i, with_edge=True) for i in removed]
+            del self.values[event[1]:]
+            self.size = event[1]
+        self._repaint(boxes)
+        # Кадр без підсвічування стає новим фоном
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+
+        highlighted = [i for i in highlighted if i < self.size]
+        if highlighted:
+            self._glow.set_offsets(self.positions[highlighted])
+            self.ax.draw_artist(self._glow)
+        self._status.set_text(f"{self._operation}: {' '.join(map(str, event[1:]))}")
+        self.ax.draw_artist(self._status)
+        self.canvas.blit(self.figure.bbox)
+
+    def play(self, interval=0.3):
+        """Відтворює журнал у вікні matplotlib."""
+        import time
+
+        plt.show(block=False)
+        self.start()
+        for event in self.events:
+            self.step(event)
+            self.canvas.flush_events()
+            time.sleep(interval)
+        plt.show()
+
+    def frames(self):
+        """Генерує кадри (RGB-масиви) для кожної події журналу без вікна."""
+        self.start()
+        for event in self.events:
+            self.step(event)
+            yield np.asarray(self.canvas.buffer_rgba())[:, :, :3].copy()
+
+def export_heap_animation(heap, path, fps=4, dpi=80):
+    """
+    Експортує анімацію журналу подій купи (Heap з trace=True) у GIF або MP4 без дисплея.
+    GIF записується через Pillow, MP4 – через ffmpeg (має бути встановлений).
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    if heap.events is None:
+        raise ValueError("Купа не записує журнал: створіть Heap(..., trace=True)")
+    figure = Figure(figsize=(8, 5), dpi=dpi)
+    FigureCanvasAgg(figure)
+    replay = HeapReplay(heap.trace_snapshot, heap.events, arity=heap.arity, figure=figure)
+
+    suffix = path.lower().rsplit(".", 1)[-1]
+    if suffix == "gif":
+        from PIL import Image
+
+        images = [Image.fromarray(frame).quantize(colors=64) for frame in replay.frames()]
+        if not images:
+            raise ValueError("Журнал подій порожній")
+        images[0].save(path, save_all=True, append_images=images[1:],
+                       duration=int(1000 / fps), loop=0)
+    elif suffix == "mp4":
+        import shutil
+        import subprocess
+
+        if shutil.which("ffmpeg") is None:
+            raise RuntimeError("Для експорту MP4 потрібен ffmpeg")
+        width, height = figure.canvas.get_width_height()
+        command = ["ffmpeg", "-y", "-loglevel", "error", "-f", "rawvideo",
+                   "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(fps),
+                   "-i", "-", "-pix_fmt", "yuv420p", "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+                   path]
+        with subprocess.Popen(command, stdin=subprocess.PIPE) as process:
+            for frame in replay.frames():
+                process.stdin.write(frame.tobytes())
+            process.stdin.close()
+        if process.returncode:
+            raise RuntimeError("ffmpeg завершився з помилкою")
+    else:
+        raise ValueError(f"Непідтримуваний формат файлу: {path} (очікується .gif або .mp4)")
+
+def benchmark_replay(sizes=(100, 10_000, 100_000), operations=50):
+    """Середній час кадру HeapReplay для куп різного розміру (має бути майже сталим)."""
+    import random
+    import time
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    print(f"{'вузлів':>9} {'подій':>7} {'мс/кадр':>9}")
+    for n in sizes:
+        heap = Heap(random.sample(range(10 * n), n), trace=True)
+        for _ in range(operations):
+            heap.push(random.randrange(10 * n))
+            heap.pop()
+        figure = Figure(figsize=(8, 5), dpi=80)
+        FigureCanvasAgg(figure)
+        replay = HeapReplay(heap.trace_snapshot, heap.events, figure=figure)
+        replay.start()
+        start = time.perf_counter()
+        for event in heap.events:
+            replay.step(event)
+        elapsed = (time.perf_counter() - start) / len(heap.events)
+        print(f"{n:>9} {len(heap.events):>7} {elapsed * 1000:>9.2f}")
+
+def benchmark_heap(n=200_000, arities=(2, 4, 8)):
+    """
+    Порівнює Heap з heapq (push n елементів, потім pop усіх, а також heapify)
+    та d-арні купи різної арності між собою.
+    """
+    import heapq
+    import random
+    import time
+
+    values = [random.random() for _ in range(n)]
+    print(f"{'купа':>10} {'heapify, с':>11} {'push, с':>9} {'pop, с':>8}")
+
+    data = values[:]
+    start = time.perf_counter()
+    heapq.heapify(data)
+    t_heapify = time.perf_counter() - start
+    data = []
+    start = time.perf_counter()
+    for value in values:
+        heapq.heappush(data, value)
+    t_push = time.perf_counter() - start
+    start = time.perf_counter()
+    while data:
+        heapq.heappop(data)
+    t_pop = time.perf_counter() - start
+    print(f"{'heapq':>10} {t_heapify:>11.3f} {t_push:>9.3f} {t_pop:>8.3f}")
+
+    for arity in arities:
+        start = time.perf_counter()
+        Heap(values, arity=arity)
+        t_heapify = time.perf_counter() - start
+        heap = Heap(arity=arity)
+        start = time.perf_counter()
+        for value in values:
+            heap.push(value)
+        t_push = time.perf_counter() - start
+        start = time.perf_counter()
+        while heap:
+            heap.pop()
+        t_pop = time.perf_counter() - start
+        print(f"{f'Heap d={arity}':>10} {t_heapify:>11.3f} {t_push:>9.3f} {t_pop:>8.3f}")
+
+def benchmark_layout(sizes=(1_000, 10_000, 100_000, 1_000_000), networkx_limit=10_000):
+    """
+    Порівнює час побудови та рендерингу (у буфер Agg, без вікна) для шляху через
+    Node/uuid/networkx і для індексного шляху draw_heap_fast.
+    Шлях networkx вимірюється лише до networkx_limit вузлів – далі він надто повільний.
+    """
+    import time
+
+    print(f"{'вузлів':>9} {'networkx, с':>12} {'індексний, с':>13}")
+    for n in sizes:
+        values = list(range(n))
+        t_networkx = float("nan")
+        if n <= networkx_limit:
+            start = time.perf_counter()
+            root = build_heap_tree(values)
+            tree = nx.DiGraph()
+            pos = {root.id: (0, 0)}
+            add_edges(tree, root, pos)
+            fig = plt.figure(figsize=(8, 5))
+            nx.draw(tree, pos=pos, arrows=False, node_size=20,
+                    node_color=[d["color"] for _, d in tree.nodes(data=True)])
+            fig.canvas.draw()
+            plt.close(fig)
+            t_networkx = time.perf_counter() - start
+
+        start = time.perf_counter()
+        fig, _, _, _ = draw_heap_fast(values, show=False)
+        fig.canvas.draw()
+        plt.close(fig)
+        t_fast = time.perf_counter() - start
+        print(f"{n:>9} {t_networkx:>12.3f} {t_fast:>13.3f}")
+
 # Приклад використання:
 if __name__ == "__main__":
+    import sys
+
+    if "--bench" in sys.argv:
+        benchmark_heap()
+        benchmark_layout()
+        benchmark_replay()
+        sys.exit()
+
     # Приклад купи (максимальна купа)
     heap = [15, 10, 8, 5, 4, 2, 1]
     draw_heap(heap)
+
+    # Та сама купа, побудована і підтримувана класом Heap
+    max_heap = Heap([1, 2, 4, 5, 8, 10, 15], kind="max")
+    max_heap.push(12)
+    draw_heap(max_heap)
+
+    # Покрокова анімація просіювань під час push/pop
+    traced = Heap([5, 3, 8, 1, 9, 2], trace=True)
+    traced.push(0)
+    traced.pop()
+    HeapReplay(traced.trace_snapshot, traced.events).play()
@@ -1,3 +1,4 @@
+import numpy as np
 import matplotlib.pyplot as plt
 from collections import deque
 
@@ -8,76 +9,366 @@ class Node:
         self.val = val
         self.left = None
         self.right = None
+        self.height = 1  # висота піддерева (для AVL-балансування)
         # Для візуалізації: координати вузла
         self.x = None
         self.y = None
 
 def insert(root, val):
-    """Вставка значення у бінарне дерево пошуку."""
+    """
+    Вставка значення у бінарне дерево пошуку (ітеративно, без рекурсії).
+    Рівні значення йдуть у праве піддерево. Повертає корінь дерева.
+    """
+    new_node = Node(val)
     if root is None:
-        return Node(val)
-    else:
-        if val < root.val:
-            root.left = insert(root.left, val)
+        return new_node
+    current = root
+    while True:
+        if val < current.val:
+            if current.left is None:
+                current.left = new_node
+                return root
+            current = current.left
         else:
-            root.right = insert(root.right, val)
+            if current.right is None:
+                current.right = new_node
+                return root
+            current = current.right
+
+def search(root, val):
+    """Ітеративний пошук вузла зі значенням val; повертає вузол або None."""
+    current = root
+    while current is not None and current.val != val:
+        current = current.left if val < current.val else current.right
+    return current
+
+def _find_path(root, val):
+    """Шлях від кореня до першого вузла зі значенням val (останній елемент – сам вузол)."""
+    path = []
+    current = root
+    while current is not None:
+        path.append(current)
+        if current.val == val:
+            return path
+        current = current.left if val < current.val else current.right
+    return None
+
+def _replace_child(path, index, old, new, root):
+    """Замінює нащадка old вузла path[index - 1] на new; повертає (можливо новий) корінь."""
+    if index == 0:
+        return new
+    parent = path[index - 1]
+    if parent.left is old:
+        parent.left = new
+    else:
+        parent.right = new
     return root
 
-def build_tree(values):
-    """Побудова дерева з послідовності значень."""
+def delete(root, val, balanced=False):
+    """
+    Ітеративне видалення першого вузла зі значенням val.
+    Вузол з двома нащадками отримує значення свого in-order наступника,
+    а видаляється сам наступник. Якщо balanced=True, дерево вважається AVL
+    і після видалення ребалансується вздовж шляху до кореня.
+    Повертає корінь дерева.
+    """
+    path = _find_path(root, val)
+    if path is None:
+        return root
+    node = path[-1]
+    if node.left is not None and node.right is not None:
+        # Шукаємо наступника – найлівіший вузол правого піддерева
+        successor = node.right
+        path.append(successor)
+        while successor.left is not None:
+            successor = successor.left
+            path.append(successor)
+        node.val = successor.val
+        node = successor
+
+    child = node.left if node.left is not None else node.right
+    root = _replace_child(path, len(path) - 1, node, child, root)
+    path.pop()
+    if balanced:
+        root = _rebalance_path(path, root)
+    return root
+
+# %% 1a. AVL-дерево (самобалансоване дерево пошуку)
+
+def _height(node):
+    return node.height if node is not None else 0
+
+def _update_height(node):
+    node.height = 1 + max(_height(node.left), _height(node.right))
+
+def _rotate_right(node):
+    pivot = node.left
+    node.left = pivot.right
+    pivot.right = node
+    _update_height(node)
+    _update_height(pivot)
+    return pivot
+
+def _rotate_left(node):
+    pivot = node.right
+    node.right = pivot.left
+    pivot.left = node
+    _update_height(node)
+    _update_height(pivot)
+    return pivot
+
+def _rebalance(node):
+    """Оновлює висоту вузла та за потреби виконує поворот; повертає новий корінь піддерева."""
+    _update_height(node)
+    balance = _height(node.left) - _height(node.right)
+    if balance > 1:
+        if _height(node.left.left) < _height(node.left.right):
+            node.left = _rotate_left(node.left)
+        return _rotate_right(node)
+    if balance < -1:
+        if _height(node.right.right) < _height(node.right.left):
+            node.right = _rotate_right(node.right)
+        return _rotate_left(node)
+    return node
+
+def _rebalance_path(path, root, stop_early=False):
+    """
+    Ребалансує вузли шляху від низу до кореня.
+    При stop_early (вставка) зупиняється, щойно висота піддерева не змінилася.
+    """
+    for i in range(len(path) - 1, -1, -1):
+        node = path[i]
+        old_height = node.height
+        subtree = _rebalance(node)
+        if subtree is not node:
+            root = _replace_child(path, i, node, subtree, root)
+        elif stop_early and node.height == old_height:
+            break
+    return root
+
+def avl_insert(root, val):
+    """
+    Ітеративна вставка в AVL-дерево: спуск зі збереженням шляху,
+    потім підйом з оновленням висот і поворотами. O(log n) у найгіршому випадку.
+    Повертає корінь дерева.
+    """
+    if root is None:
+        return Node(val)
+    path = []
+    current = root
+    while current is not None:
+        path.append(current)
+        current = current.left if val < current.val else current.right
+    parent = path[-1]
+    if val < parent.val:
+        parent.left = Node(val)
+    else:
+        parent.right = Node(val)
+    return _rebalance_path(path, root, stop_early=True)
+
+def avl_delete(root, val):
+    """Видалення з AVL-дерева з ребалансуванням; повертає корінь дерева."""
+    return delete(root, val, balanced=True)
+
+def build_balanced_from_sorted(values):
+    """
+    Будує ідеально збалансоване дерево з відсортованої послідовності за O(n):
+    корінь кожного піддерева – середній елемент свого діапазону.
+    Глибина рекурсії – лише log2(n). Невідсортований вхід дав би дерево,
+    що не є деревом пошуку, тому він відхиляється (ValueError).
+    """
+    values = list(values)
+    if any(values[i] > values[i + 1] for i in range(len(values) - 1)):
+        raise ValueError("build_balanced_from_sorted очікує відсортовану послідовність")
+
+    def build(lo, hi):
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        node = Node(values[mid])
+        node.left = build(lo, mid)
+        node.right = build(mid + 1, hi)
+        node.height = 1 + max(_height(node.left), _height(node.right))
+        return node
+
+    return build(0, len(values))
+
+def build_tree(values, method="bst"):
+    """
+    Побудова дерева з послідовності значень.
+    method:
+      "bst"      - звичайне дерево пошуку (порядок вставки визначає форму);
+      "avl"      - самобалансоване AVL-дерево, O(n log n) для будь-якого входу;
+      "balanced" - ідеально збалансоване дерево; вхід сортується
+                   (для вже відсортованого – за O(n)).
+    """
+    if method == "balanced":
+        return build_balanced_from_sorted(sorted(values))
+    if method == "avl":
+        add = avl_insert
+    elif method == "bst":
+        add = insert
+    else:
+        raise ValueError(f"Невідомий метод побудови дерева: {method}")
     root = None
     for v in values:
-        root = insert(root, v)
+        root = add(root, v)
     return root
 
+def tree_height(root):
+    """Висота дерева (ітеративно, обходом у ширину)."""
+    height = 0
+    level = [root] if root is not None else []
+    while level:
+        height += 1
+        level = [child for node in level for child in (node.left, node.right) if child]
+    return height
+
 # %% 2. Присвоєння координат вузлам для візуалізації
 
-def assign_positions(node, depth=0, pos=[0]):
+def assign_positions(node, depth=0, pos=None):
     """
-    In-order обхід для присвоєння координат:
-      - x: порядковий номер у in-order обході,
+    Ітеративний in-order обхід для присвоєння координат:
+      - x: порядковий номер у in-order обході (починаючи з pos[0], якщо передано),
       - y: від'ємна глибина (щоб корінь був у верхній частині).
     """
-    if node is None:
-        return
-    assign_positions(node.left, depth + 1, pos)
-    node.x = pos[0]
-    node.y = -depth
-    pos[0] += 1
-    assign_positions(node.right, depth + 1, pos)
+    counter = pos[0] if pos else 0
+    stack = []
+    current = node
+    while stack or current is not None:
+        # Спускаємося ліворуч, запам'ятовуючи глибину кожного вузла
+        while current is not None:
+            stack.append((current, depth))
+            current = current.left
+            depth += 1
+        current, depth = stack.pop()
+        current.x = counter
+        current.y = -depth
+        counter += 1
+        current = current.right
+        depth += 1
+    if pos:
+        pos[0] = counter
+
+def collect_nodes(root):
+    """Список усіх вузлів дерева (pre-order, без рекурсії)."""
+    return list(_preorder_nodes(root))
 
 # %% 3. Ітеративні обходи дерева
 
-def dfs_iterative(root):
-    """Ітеративний обхід у глибину (pre-order) за допомогою стеку."""
-    stack = []
-    order = []  # список вузлів у порядку відвідування
-    if root is not None:
-        stack.append(root)
+def _preorder_nodes(root):
+    """Генератор вузлів у порядку pre-order (стек, без рекурсії)."""
+    stack = [root] if root is not None else []
     while stack:
         node = stack.pop()
-        order.append(node)
-        # Для pre-order: спочатку додаємо праве, потім ліве (щоб ліве оброблялося першим)
+        yield node
+        # Спочатку додаємо праве, потім ліве (щоб ліве оброблялося першим)
         if node.right:
             stack.append(node.right)
         if node.left:
             stack.append(node.left)
-    return order
 
-def bfs_iterative(root):
-    """Ітеративний обхід у ширину за допомогою черги."""
-    q = deque()
-    order = []  # список вузлів у порядку відвідування
-    if root is not None:
-        q.append(root)
+def _inorder_nodes(root):
+    """Генератор вузлів у порядку in-order (стек висотою O(h))."""
+    stack = []
+    current = root
+    while stack or current is not None:
+        while current is not None:
+            stack.append(current)
+            current = current.left
+        current = stack.pop()
+        yield current
+        current = current.right
+
+def _postorder_nodes(root):
+    """Генератор вузлів у порядку post-order (один стек і останній відвіданий вузол)."""
+    stack = []
+    current = root
+    last = None
+    while stack or current is not None:
+        while current is not None:
+            stack.append(current)
+            current = current.left
+        node = stack[-1]
+        if node.right is not None and node.right is not last:
+            current = node.right
+        else:
+            stack.pop()
+            yield node
+            last = node
+
+def _levelorder_nodes(root):
+    """Генератор вузлів у порядку обходу в ширину (черга)."""
+    q = deque([root] if root is not None else [])
     while q:
         node = q.popleft()
-        order.append(node)
+        yield node
         if node.left:
             q.append(node.left)
         if node.right:
             q.append(node.right)
-    return order
+
+def _morris_step(current, preorder):
+    """
+    Один крок обходу Морріса. Повертає (наступний вузол, вузол для видачі або None).
+    Тимчасова "нитка" pred.right -> current замінює стек і прибирається при поверненні.
+    """
+    if current.left is None:
+        return current.right, current
+    pred = current.left
+    while pred.right is not None and pred.right is not current:
+        pred = pred.right
+    if pred.right is None:
+        pred.right = current  # ставимо нитку, щоб повернутися до current
+        return current.left, current if preorder else None
+    pred.right = None  # лівe піддерево пройдене – прибираємо нитку
+    return current.right, None if preorder else current
+
+def _morris_nodes(root, preorder=False):
+    """
+    Обхід Морріса (in-order або pre-order) з O(1) додаткової пам'яті.
+    Дерево тимчасово змінюється, тому при достроковій зупинці генератора
+    обхід мовчки доходить до кінця й відновлює всі посилання.
+    """
+    current = root
+    try:
+        while current is not None:
+            current, node = _morris_step(current, preorder)
+            if node is not None:
+                yield node
+    finally:
+        while current is not None:
+            current, _ = _morris_step(current, preorder)
+
+def iter_preorder(root, morris=False):
+    """Ледачий pre-order обхід: генерує значення вузлів (morris=True – O(1) пам'яті)."""
+    nodes = _morris_nodes(root, preorder=True) if morris else _preorder_nodes(root)
+    for node in nodes:
+        yield node.val
+
+def iter_inorder(root, morris=False):
+    """Ледачий in-order обхід: генерує значення вузлів (morris=True – O(1) пам'яті)."""
+    nodes = _morris_nodes(root) if morris else _inorder_nodes(root)
+    for node in nodes:
+        yield node.val
+
+def iter_postorder(root):
+    """Ледачий post-order обхід: генерує значення вузлів."""
+    for node in _postorder_nodes(root):
+        yield node.val
+
+def iter_levelorder(root):
+    """Ледачий обхід у ширину: генерує значення вузлів."""
+    for node in _levelorder_nodes(root):
+        yield node.val
+
+def dfs_iterative(root):
+    """Ітеративний обхід у глибину (pre-order) за допомогою стеку."""
+    return list(_preorder_nodes(root))  # список вузлів у порядку відвідування
+
+def bfs_iterative(root):
+    """Ітеративний обхід у ширину за допомогою черги."""
+    return list(_levelorder_nodes(root))  # список вузлів у порядку відвідування
 
 # %% 4. Генерація кольорів для вузлів
 
@@ -93,6 +384,15 @@ def get_color(index, total, base_color=(18, 150, 240), lower_factor=0.3, upper_f
     b = int(base_color[2] * factor)
     return f"#{r:02X}{g:02X}{b:02X}"
 
+def traversal_colors(total, base_color=(18, 150, 240), lower_factor=0.3, upper_factor=1.0):
+    """Векторизований аналог get_color: масив RGBA (total, 4) для кроків 0..total-1."""
+    fraction = np.arange(total) / (total - 1) if total > 1 else np.ones(total)
+    factor = lower_factor + fraction * (upper_factor - lower_factor)
+    colors = np.ones((total, 4))
+    # Як і в get_color, компоненти округлюються до цілих 0..255
+    colors[:, :3] = np.floor(np.outer(factor, base_color)) / 255
+    return colors
+
 # %% 5. Функції візуалізації
 
 def draw_tree(root, traversal_order, title="Tree Traversal"):
@@ -105,14 +405,8 @@ def draw_tree(root, traversal_order, title="Tree Traversal"):
     order_index = {node: i for i, node in enumerate(traversal_order)}
     total = len(traversal_order)
     
-    # Збираємо всі вузли (можна обійти рекурсивно — це прийнятно для візуалізації)
-    nodes = []
-    def collect_nodes(node):
-        if node:
-            nodes.append(node)
-            collect_nodes(node.left)
-            collect_nodes(node.right)
-    collect_nodes(root)
+    # Збираємо всі вузли
+    nodes = collect_nodes(root)
     
     fig, ax = plt.subplots(figsize=(8, 5))
     
@@ -145,13 +439,7 @@ def animate_traversal(root, traversal_order, title="Traversal Animation"):
       - потім, крок за кроком, змінюється колір вузлів згідно з порядком обходу.
     """
     # Збираємо всі вузли для малювання
-    nodes = []
-    def collect_nodes(node):
-        if node:
-            nodes.append(node)
-            collect_nodes(node.left)
-            collect_nodes(node.right)
-    collect_nodes(root)
+    nodes = collect_nodes(root)
     
     fig, ax = plt.subplots(figsize=(8, 5))
     
@@ -190,9 +478,339 @@ def animate_traversal(root, traversal_order, title="Traversal Animation"):
     plt.show()
     plt.close(fig)  # Закриваємо фігуру після завершення анімації
 
+def benchmark_build(n=1_000_000, bst_limit=5_000):
+    """
+    Час побудови та висота дерева для відсортованого, випадкового й оберненого входу.
+    Звичайне BST на впорядкованому вході вироджується у список (O(n²)),
+    тож для нього розмір обмежено bst_limit.
+    """
+    import random
+    import time
+
+    inputs = {
+        "відсортований": list(range(n)),
+        "випадковий": random.sample(range(n), n),
+        "обернений": list(range(n, 0, -1)),
+    }
+    print(f"{'вхід':>15} {'метод':>9} {'n':>9} {'час, с':>8} {'висота':>7}")
+    for name, values in inputs.items():
+        for method in ("bst", "avl", "balanced"):
+            data = values
+            if method == "bst" and name != "випадковий":
+                data = values[:bst_limit]
+            if method == "balanced":
+                data = sorted(values)
+            start = time.perf_counter()
+            root = build_tree(data, method=method)
+            elapsed = time.perf_counter() - start
+            print(f"{name:>15} {method:>9} {len(data):>9} {elapsed:>8.2f} {tree_height(root):>7}")
+
+def chain_tree(n):
+    """Вироджене дерево-ланцюжок глибини n (найгірший випадок для рекурсії та стеку)."""
+    root = None
+    for val in range(n, 0, -1):
+        node = Node(val)
+        node.right = root
+        root = node
+    return root
+
+def benchmark_traversals(n=200_000, first=10):
+    """
+    Пам'ять і швидкість обходів на глибоких деревах: ланцюжку глибини n
+    та ідеально збалансованому дереві з n вузлів. Також час отримання
+    перших first значень (генератор зупиняється без побудови повного списку).
+    """
+    import itertools
+    import time
+    import tracemalloc
+
+    trees = {"ланцюжок": chain_tree(n), "збалансоване": build_tree(range(n), "balanced")}
+    traversals = {
+        "pre-order": iter_preorder,
+        "in-order": iter_inorder,
+        "post-order": iter_postorder,
+        "level-order": iter_levelorder,
+        "Morris in": lambda root: iter_inorder(root, morris=True),
+        "Morris pre": lambda root: iter_preorder(root, morris=True),
+        "список dfs": lambda root: (node.val for node in dfs_iterative(root)),
+    }
+    print(f"{'дерево':>13} {'обхід':>12} {'час, с':>8} {'пік пам., КБ':>13} {'перші, мкс':>11}")
+    for tree_name, root in trees.items():
+        for name, traversal in traversals.items():
+            tracemalloc.start()
+            start = time.perf_counter()
+            for _ in traversal(root):
+                pass
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            start = time.perf_counter()
+            list(itertools.islice(traversal(root), first))
+            t_first = time.perf_counter() - start
+            print(f"{tree_name:>13} {name:>12} {elapsed:>8.3f} {peak / 1024:>13.0f} "
+                  f"{t_first * 1e6:>11.0f}")
+
+# %% 5a. Пакетна візуалізація для великих дерев
+
+def draw_tree_fast(root, traversal_order=None, title="Tree Traversal", ax=None,
+                   label_limit=100, show=True):
+    """
+    Пакетна візуалізація дерева:
+      - усі ребра – одна лінія з розривами NaN (один шлях замість ax.plot на ребро),
+      - усі вузли – один scatter з масивом кольорів; розмір вузла підбирається
+        за відстанню між сусідніми вузлами на полотні, а межі осей мають запас
+        на радіус вузла,
+      - підписи значень – лише для невеликих дерев (до label_limit вузлів),
+        якщо шрифт, вписаний у вузол, ще читабельний.
+    Якщо traversal_order передано, вузли розфарбовуються за порядком обходу,
+    інакше – сірим. Повертає (fig, ax, scatter, colors, index, labels), де
+    colors – масив RGBA вузлів, а index – словник вузол -> номер у масиві.
+    """
+    if root is not None and root.x is None:
+        assign_positions(root)
+    nodes = collect_nodes(root)
+    index = {node: i for i, node in enumerate(nodes)}
+    positions = np.array([(node.x, node.y) for node in nodes], dtype=float).reshape(-1, 2)
+
+    segments = [(node.x, node.y, child.x, child.y)
+                for node in nodes for child in (node.left, node.right) if child]
+    lines = np.full((len(segments), 3, 2), np.nan)
+    if segments:
+        lines[:, :2] = np.array(segments, dtype=float).reshape(-1, 2, 2)
+    lines = lines.reshape(-1, 2)
+
+    colors = np.tile(np.array([0.5, 0.5, 0.5, 1.0]), (len(nodes), 1))  # сірий
+    if traversal_order is not None:
+        order = [index[node] for node in traversal_order]
+        colors[order] = traversal_colors(len(order))
+
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(8, 5))
+    else:
+        fig = ax.figure
+    ax.plot(lines[:, 0], lines[:, 1], 'k-', linewidth=1, zorder=1)
+    # Межі з запасом у пів кроку сітки (крок 1 по x і по y): вузли на краях
+    # не обрізаються, а корінь не залазить на заголовок
+    (xmin, ymin), (xmax, ymax) = (positions.min(axis=0), positions.max(axis=0)) \
+        if len(nodes) else ((0, 0), (0, 0))
+    ax.set_xlim(xmin - 0.5, xmax + 0.5)
+    ax.set_ylim(ymin - 0.5, ymax + 0.5)
+    # Діаметр вузла (у пунктах) – 0.9 кроку сітки на полотні, не більше 24.5 пт
+    # (s = 600), тож сусідні вузли не злипаються за будь-якого розміру дерева
+    box = ax.get_window_extent()
+    step = min(box.width / (xmax - xmin + 1), box.height / (ymax - ymin + 1))
+    diameter = min(0.9 * step * 72 / fig.dpi, 24.5)
+    size = max(diameter ** 2, 2.0)
+    # Підписи – лише якщо шрифт, вписаний у вузол, ще читабельний
+    fontsize = min(10.0, 0.4 * diameter)
+    labeled = len(nodes) <= label_limit and fontsize >= 6
+    scatter = ax.scatter(positions[:, 0], positions[:, 1], s=size, c=colors,
+                         edgecolors='black' if labeled else 'none', zorder=3)
+    labels = []
+    if labeled:
+        labels = [ax.text(node.x, node.y, str(node.val), ha='center', va='center',
+                          color='white', fontsize=fontsize, zorder=4) for node in nodes]
+    ax.set_title(title, fontsize=14)
+    ax.axis('off')
+    if show:
+        plt.show()
+        plt.close(fig)
+    return fig, ax, scatter, colors, index, labels
+
+class TraversalReplay:
+    """
+    Покадрове відтворення обходу дерева з інкрементним малюванням.
+
+    Дерево малюється один раз (draw_tree_fast) сірим, після чого кадр малює
+    лише щойно відвіданий вузол: фон береться з копії полотна (blitting),
+    поверх нього малюється одноточковий scatter з кольором кроку (і підпис),
+    і отриманий кадр стає новим фоном. Рядок стану малюється поверх без
+    збереження у фон. Тому вартість кадру залежить від розміру полотна,
+    а не від кількості вузлів дерева.
+
+    FuncAnimation(blit=True) тут не підходить: він відновлює фон, збережений
+    лише при зміні меж осей, і перемальовує всі анімовані артисти кожного кадру.
+    Щоб зберегти вже розфарбовані вузли, довелося б або перемальовувати весь
+    масив кольорів (кадр знову O(n)), або оновлювати приватний кеш фону.
+    Власний цикл blitting накопичує кадри у фоні й працює без вікна (frames).
+    """
+
+    def __init__(self, root, traversal_order, title="Traversal Animation", figure=None,
+                 label_limit=100):
+        self.order = list(traversal_order)
+        self.step_colors = traversal_colors(len(self.order))
+        if figure is None:
+            figure = plt.figure(figsize=(8, 5))
+        ax = figure.add_subplot()
+        _, self.ax, scatter, _, _, labels = draw_tree_fast(
+            root, title=title, ax=ax, label_limit=label_limit, show=False)
+        self.figure = figure
+        self.canvas = figure.canvas
+        self.show_labels = bool(labels)
+
+        # Невеликі анімовані артисти: відвіданий вузол, його підпис і рядок стану
+        self._node = ax.scatter([], [], s=scatter.get_sizes()[0], zorder=3, animated=True,
+                                edgecolors="black" if self.show_labels else "none")
+        fontsize = labels[0].get_fontsize() if labels else 10
+        self._label = ax.text(0, 0, "", ha="center", va="center", color="white",
+                              fontsize=fontsize, zorder=4, animated=True)
+        self._status = ax.text(0.5, 0.02, "", transform=figure.transFigure, ha="center",
+                               va="bottom", fontsize=12, animated=True)
+        self._background = None
+
+    def start(self):
+        """Малює статичне дерево і запам'ятовує його як фон."""
+        self.canvas.draw()
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+
+    def step(self, i):
+        """Розфарбовує i-й вузол обходу, перемальовуючи лише його."""
+        node = self.order[i]
+        self.canvas.restore_region(self._background)
+        self._node.set_offsets([(node.x, node.y)])
+        self._node.set_facecolor(self.step_colors[i])
+        self.ax.draw_artist(self._node)
+        if self.show_labels:
+            self._label.set_position((node.x, node.y))
+            self._label.set_text(str(node.val))
+            self.ax.draw_artist(self._label)
+        # Кадр без рядка стану стає новим фоном
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+
+        self._status.set_text(f"Крок {i + 1}: вузол {node.val}")
+        self.ax.draw_artist(self._status)
+        self.canvas.blit(self.figure.bbox)
+
+    def play(self, interval=0.5):
+        """Відтворює обхід у вікні matplotlib."""
+        import time
+
+        plt.show(block=False)
+        self.start()
+        for i in range(len(self.order)):
+            self.step(i)
+            self.canvas.flush_events()
+            time.sleep(interval)
+        plt.show()
+
+    def frames(self):
+        """Генерує кадри (RGB-масиви) для кожного кроку обходу без вікна."""
+        self.start()
+        for i in range(len(self.order)):
+            self.step(i)
+            yield np.asarray(self.canvas.buffer_rgba())[:, :, :3].copy()
+
+def animate_traversal_fast(root, traversal_order, title="Traversal Animation",
+                           interval=500, out=None, fps=4, label_limit=100, dpi=80):
+    """
+    Анімація обходу з blitting (див. TraversalReplay): кожен кадр малює лише
+    щойно відвіданий вузол, тож вартість кадру не залежить від розміру дерева.
+    Якщо out задано, анімація зберігається без вікна: GIF – через Pillow,
+    MP4 – через ffmpeg (має бути встановлений). Повертає об'єкт TraversalReplay.
+    """
+    if out is None:
+        replay = TraversalReplay(root, traversal_order, title, label_limit=label_limit)
+        replay.play(interval / 1000)
+        plt.close(replay.figure)
+        return replay
+
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figure = Figure(figsize=(8, 5), dpi=dpi)
+    FigureCanvasAgg(figure)
+    replay = TraversalReplay(root, traversal_order, title, figure=figure,
+                             label_limit=label_limit)
+    suffix = out.lower().rsplit(".", 1)[-1]
+    if suffix == "gif":
+        from PIL import Image
+
+        images = [Image.fromarray(frame).quantize(colors=64) for frame in replay.frames()]
+        if not images:
+            raise ValueError("Порядок обходу порожній")
+        images[0].save(out, save_all=True, append_images=images[1:],
+                       duration=int(1000 / fps), loop=0)
+    elif suffix == "mp4":
+        import shutil
+        import subprocess
+
+        if shutil.which("ffmpeg") is None:
+            raise RuntimeError("Для експорту MP4 потрібен ffmpeg")
+        width, height = figure.canvas.get_width_height()
+        command = ["ffmpeg", "-y", "-loglevel", "error", "-f", "rawvideo",
+                   "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(fps),
+                   "-i", "-", "-pix_fmt", "yuv420p", "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+                   out]
+        with subprocess.Popen(command, stdin=subprocess.PIPE) as process:
+            for frame in replay.frames():
+                process.stdin.write(frame.tobytes())
+            process.stdin.close()
+        if process.returncode:
+            raise RuntimeError("ffmpeg завершився з помилкою")
+    else:
+        raise ValueError(f"Непідтримуваний формат файлу: {out} (очікується .gif або .mp4)")
+    return replay
+
+def benchmark_frames(sizes=(100, 1_000, 10_000, 100_000), steps=20):
+    """
+    Середній час кадру анімації (у буфер Agg, без вікна):
+      - старий підхід: patch.set_color + повне перемальовування полотна;
+      - новий (TraversalReplay): blitting лише щойно відвіданого вузла.
+    """
+    import random
+    import time
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    print(f"{'вузлів':>8} {'старий, мс':>11} {'blit, мс':>9}")
+    for n in sizes:
+        root = build_tree(random.sample(range(n), n), "avl")
+        assign_positions(root)
+        order = bfs_iterative(root)[:steps]
+
+        t_old = float("nan")
+        if n <= 10_000:
+            fig = Figure(figsize=(8, 5))
+            canvas = FigureCanvasAgg(fig)
+            ax = fig.add_subplot()
+            patches = {}
+            for node in collect_nodes(root):
+                if node.left:
+                    ax.plot([node.x, node.left.x], [node.y, node.left.y], 'k-')
+                if node.right:
+                    ax.plot([node.x, node.right.x], [node.y, node.right.y], 'k-')
+                patches[node] = plt.Circle((node.x, node.y), 0.3, color='gray', zorder=3)
+                ax.add_artist(patches[node])
+            ax.autoscale_view()
+            canvas.draw()
+            start = time.perf_counter()
+            for i, node in enumerate(order):
+                patches[node].set_color(get_color(i, len(order)))
+                canvas.draw()
+            t_old = (time.perf_counter() - start) / len(order)
+
+        fig = Figure(figsize=(8, 5))
+        FigureCanvasAgg(fig)
+        replay = TraversalReplay(root, order, figure=fig)
+        replay.start()
+        start = time.perf_counter()
+        for i in range(len(order)):
+            replay.step(i)
+        t_blit = (time.perf_counter() - start) / len(order)
+        print(f"{n:>8} {t_old * 1000:>11.1f} {t_blit * 1000:>9.1f}")
+
 # %% 6. Головна частина програми
 
 if __name__ == "__main__":
+    import sys
+
+    if "--bench" in sys.argv:
+        benchmark_build()
+        benchmark_traversals()
+        benchmark_frames()
+        sys.exit()
+
     # Створюємо дерево з фіксованим набором значень
     values = [50, 30, 70, 20, 40, 60, 80]
     root = build_tree(values)
@@ -211,3 +829,11 @@ if __name__ == "__main__":
     # Анімація обходів
     animate_traversal(root, dfs_order, title="Анімація DFS (pre-order)")
     animate_traversal(root, bfs_order, title="Анімація BFS")
+
+    # Пакетна візуалізація та анімація для великого дерева
+    big_root = build_tree(range(1023), "balanced")
+    assign_positions(big_root)
+    big_order = bfs_iterative(big_root)
+    draw_tree_fast(big_root, big_order, title="BFS (1023 вузли)")
+    animate_traversal_fast(big_root, big_order[:60], title="Анімація BFS (1023 вузли)",
+                           interval=50)
@@ -1,3 +1,9 @@
+import sys
+from bisect import bisect_right
+from itertools import accumulate
+
+import numpy as np
+
 # Дані про страви
 items = {
     "pizza": {"cost": 50, "calories": 300},
@@ -43,11 +49,15 @@ def greedy_algorithm(items, budget):
     }
     return result
 
-def dynamic_programming(items, budget):
+def dynamic_programming(items, budget, lean=False):
     """
     Динамічне програмування для задачі 0/1 рюкзака:
     знаходимо набір страв із максимальною сумарною калорійністю, не перевищуючи бюджет.
+    lean=True – економний режим (див. dynamic_programming_lean) з тим самим результатом.
     """
+    if lean:
+        return dynamic_programming_lean(items, budget)
+
     # Перетворимо словник на список кортежів: (name, cost, calories)
     item_list = []
     for name, info in items.items():
@@ -88,8 +98,697 @@ def dynamic_programming(items, budget):
     }
     return result
 
+# Перетворення 0/1 у символи '0'/'1' для пакування рядка рішень у біти
+_FLAG_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+
+def dynamic_programming_lean(items, budget):
+    """
+    Економний за пам'яттю варіант dynamic_programming:
+      - замість таблиці (n+1) x (budget+1) зберігається один рядок dp,
+        який оновлюється для кожної страви з кінця (w від budget до cost),
+        тож кожна страва використовується не більше одного разу;
+      - рішення "брати страву i при бюджеті w" зберігаються у бітовій матриці:
+        для кожної страви – одне ціле число, де біт w означає, що страву взято.
+    Пам'ять: O(budget) чисел + n * budget / 8 байтів замість n * budget об'єктів.
+    Страва береться лише тоді, коли це строго покращує результат, тому
+    відновлений набір збігається з dynamic_programming.
+    """
+    item_list = []
+    for name, info in items.items():
+        item_list.append((name, info["cost"], info["calories"]))
+
+    dp = [0] * (budget + 1)
+    choices = []
+    for name, cost, calories in item_list:
+        taken = bytearray(budget + 1)
+        for w in range(budget, cost - 1, -1):
+            candidate = dp[w - cost] + calories
+            if candidate > dp[w]:
+                dp[w] = candidate
+                taken[w] = 1
+        # Рядок прапорців -> ціле число (біт w – прапорець для бюджету w)
+        choices.append(int(taken.translate(_FLAG_DIGITS)[::-1] or b"0", 2))
+
+    # Відновлюємо вибір страв з кінця, як і в табличному варіанті
+    w = budget
+    chosen = []
+    total_cost = 0
+    for i in range(len(item_list) - 1, -1, -1):
+        if choices[i] >> w & 1:
+            name, cost, calories = item_list[i]
+            chosen.append(name)
+            total_cost += cost
+            w -= cost
+    chosen.reverse()
+
+    result = {
+        "chosen_items": chosen,
+        "total_cost": total_cost,
+        "total_calories": dp[budget]
+    }
+    return result
+
+def _knapsack_numpy(item_list, capacity):
+    """
+    Векторизований 0/1 рюкзак: для кожної страви один np.maximum над зсунутими
+    зрізами рядка dp (dp[cost:] vs dp[:-cost] + calories) замість циклу по w.
+    Повертає фінальний рядок dp (оптимум для кожного бюджету 0..capacity)
+    і бітову матрицю рішень (np.packbits по рядку на страву).
+    """
+    integral = all(isinstance(calories, int) for _, _, calories in item_list)
+    dp = np.zeros(capacity + 1, dtype=np.int64 if integral else np.float64)
+    choices = []
+    for name, cost, calories in item_list:
+        if cost > capacity:
+            choices.append(None)
+            continue
+        candidate = dp[:capacity + 1 - cost] + calories
+        taken = np.zeros(capacity + 1, dtype=bool)
+        np.greater(candidate, dp[cost:], out=taken[cost:])
+        np.maximum(dp[cost:], candidate, out=dp[cost:])
+        choices.append(np.packbits(taken))
+    return dp, choices
+
+def _backtrack_numpy(item_list, choices, dp, budget):
+    """Відновлює набір страв для бюджету budget з бітової матриці _knapsack_numpy."""
+    w = budget
+    chosen = []
+    total_cost = 0
+    for i in range(len(item_list) - 1, -1, -1):
+        bits = choices[i]
+        if bits is not None and bits[w >> 3] >> (7 - (w & 7)) & 1:
+            name, cost, calories = item_list[i]
+            chosen.append(name)
+            total_cost += cost
+            w -= cost
+    chosen.reverse()
+    return {
+        "chosen_items": chosen,
+        "total_cost": total_cost,
+        "total_calories": dp[budget].item()
+    }
+
+def dynamic_programming_numpy(items, budget):
+    """
+    Векторизований NumPy-варіант dynamic_programming з тим самим результатом.
+    Пам'ять: рядок dp + n * budget / 8 байтів бітової матриці рішень.
+    """
+    return dynamic_programming_many(items, [budget])[0]
+
+def dynamic_programming_many(items, budgets):
+    """
+    Відповідає на запити для багатьох бюджетів за один прохід DP:
+    фінальний рядок уже містить оптимум для кожного бюджету <= max(budgets),
+    а бітова матриця дозволяє відновити набір страв для будь-якого з них.
+    Повертає список результатів у порядку budgets.
+    """
+    budgets = list(budgets)
+    if not budgets:
+        return []
+    item_list = []
+    for name, info in items.items():
+        item_list.append((name, info["cost"], info["calories"]))
+    dp, choices = _knapsack_numpy(item_list, max(budgets))
+    return [_backtrack_numpy(item_list, choices, dp, budget) for budget in budgets]
+
+def max_calories_for_budgets(items, budgets):
+    """Лише оптимальні калорійності для кількох бюджетів (без відновлення наборів)."""
+    budgets = list(budgets)
+    if not budgets:
+        return []
+    item_list = [(name, info["cost"], info["calories"]) for name, info in items.items()]
+    dp, _ = _knapsack_numpy(item_list, max(budgets))
+    return dp[budgets].tolist()
+
+def _result(item_list, chosen_indices):
+    """Формує результат у форматі dynamic_programming (страви – у порядку меню)."""
+    chosen_indices = sorted(chosen_indices)
+    return {
+        "chosen_items": [item_list[i][0] for i in chosen_indices],
+        "total_cost": sum(item_list[i][1] for i in chosen_indices),
+        "total_calories": sum(item_list[i][2] for i in chosen_indices)
+    }
+
+def branch_and_bound(items, budget):
+    """
+    Точний метод гілок і меж для 0/1 рюкзака, не залежний від величини бюджету
+    (вартості можуть бути великими цілими або дробовими числами).
+      - страви впорядковуються за спаданням калорії/вартість, як у greedy_algorithm;
+      - верхня межа вузла – дробова релаксація: жадібно добираємо страви,
+        а останню, що не влазить, беремо частково; межа рахується за O(log n)
+        через префіксні суми і bisect;
+      - початковий рекорд – жадібний розв'язок; обхід у глибину з явним стеком,
+        гілка "взяти" розглядається першою.
+    """
+    item_list = [(name, info["cost"], info["calories"]) for name, info in items.items()]
+    order = sorted(range(len(item_list)),
+                   key=lambda i: item_list[i][2] / item_list[i][1] if item_list[i][1]
+                   else float("inf"),
+                   reverse=True)
+    costs = [item_list[i][1] for i in order]
+    values = [item_list[i][2] for i in order]
+    n = len(order)
+    cost_prefix = [0, *accumulate(costs)]
+    value_prefix = [0, *accumulate(values)]
+
+    def upper_bound(i, remaining):
+        # Останній індекс j, для якого страви i..j-1 влазять повністю
+        j = bisect_right(cost_prefix, cost_prefix[i] + remaining, i) - 1
+        bound = value_prefix[j] - value_prefix[i]
+        if j < n:
+            bound += values[j] * (remaining - (cost_prefix[j] - cost_prefix[i])) / costs[j]
+        return bound
+
+    # Жадібний розв'язок як початковий рекорд
+    best_value = 0
+    best_taken = None
+    remaining = budget
+    for i in range(n):
+        if costs[i] <= remaining:
+            remaining -= costs[i]
+            best_value += values[i]
+            best_taken = (i, best_taken)
+
+    # Вузол: (наступна страва, залишок бюджету, калорійність, взяті страви як зв'язний список)
+    stack = [(0, budget, 0, None)]
+    while stack:
+        i, remaining, value, taken = stack.pop()
+        # Пропускаємо страви, що вже не влазять
+        while i < n and costs[i] > remaining:
+            i += 1
+        if i == n:
+            if value > best_value:
+                best_value, best_taken = value, taken
+            continue
+        if value + upper_bound(i, remaining) <= best_value:
+            continue
+        stack.append((i + 1, remaining, value, taken))
+        stack.append((i + 1, remaining - costs[i], value + values[i], (i, taken)))
+
+    chosen = []
+    while best_taken is not None:
+        i, best_taken = best_taken
+        chosen.append(order[i])
+    return _result(item_list, chosen)
+
+def _subset_sums(costs, values):
+    """
+    Вартості й калорійності всіх 2^k підмножин: масиви подвоюються для кожної
+    страви, тож індекс елемента – це бітова маска підмножини.
+    """
+    all_costs = np.zeros(1, dtype=np.asarray(costs).dtype if costs else np.int64)
+    all_values = np.zeros(1, dtype=np.asarray(values).dtype if values else np.int64)
+    for cost, value in zip(costs, values):
+        all_costs = np.concatenate((all_costs, all_costs + cost))
+        all_values = np.concatenate((all_values, all_values + value))
+    return all_costs, all_values
+
+def meet_in_the_middle(items, budget, max_items=40):
+    """
+    Точний метод "зустрічі посередині" для n <= max_items (~40):
+    меню ділиться навпіл, для кожної половини перебираються всі 2^(n/2)
+    підмножин; у другій половині залишаються лише недоміновані підмножини
+    (дорожча має бути калорійнішою), і для кожної підмножини першої половини
+    найкраща пара знаходиться бінарним пошуком (np.searchsorted).
+    Складність O(2^(n/2) * n), незалежно від величини бюджету.
+    """
+    item_list = [(name, info["cost"], info["calories"]) for name, info in items.items()]
+    n = len(item_list)
+    if n > max_items:
+        raise ValueError(f"meet_in_the_middle підтримує до {max_items} страв, отримано {n}")
+    half = n // 2
+    left_costs, left_values = _subset_sums([c for _, c, _ in item_list[:half]],
+                                           [v for _, _, v in item_list[:half]])
+    right_costs, right_values = _subset_sums([c for _, c, _ in item_list[half:]],
+                                             [v for _, _, v in item_list[half:]])
+
+    # Права половина: сортуємо за вартістю і беремо префіксний максимум калорійності
+    order = np.lexsort((-right_values, right_costs))
+    right_costs = right_costs[order]
+    best_right = np.maximum.accumulate(right_values[order])
+    # Маска підмножини, на якій досягається префіксний максимум
+    is_record = np.empty(len(order), dtype=bool)
+    is_record[0] = True
+    is_record[1:] = best_right[1:] > best_right[:-1]
+    record_index = np.maximum.accumulate(np.where(is_record, np.arange(len(order)), 0))
+    best_right_mask = order[record_index]
+
+    fits = left_costs <= budget
+    left_masks = np.nonzero(fits)[0]
+    j = np.searchsorted(right_costs, budget - left_costs[fits], side="right") - 1
+    totals = left_values[fits] + best_right[j]
+    k = int(np.argmax(totals))
+    left_mask = int(left_masks[k])
+    right_mask = int(best_right_mask[j[k]])
+
+    chosen = [i for i in range(half) if left_mask >> i & 1]
+    chosen += [half + i for i in range(n - half) if right_mask >> i & 1]
+    return _result(item_list, chosen)
+
+# Поріг n * budget, до якого табличний (NumPy) DP вважається дешевим (~0.1 с)
+DP_CELL_LIMIT = 10**8
+
+def _integral_budget(budget):
+    """Бюджет як int, якщо він цілий (int або float на кшталт 100.0), інакше None."""
+    if isinstance(budget, int):
+        return budget
+    if isinstance(budget, float) and budget.is_integer():
+        return int(budget)
+    return None
+
+def choose_method(items, budget):
+    """
+    Правило вибору методу для solve(method="auto"):
+      greedy, якщо влазять усі страви (тоді він точний);
+      NumPy DP, якщо вартості й бюджет цілі (бюджет може бути float
+      з цілим значенням, наприклад 100.0) і n * budget <= DP_CELL_LIMIT;
+      інакше гілки і межі.
+    """
+    costs = [info["cost"] for info in items.values()]
+    if sum(costs) <= budget:
+        return "greedy"
+    if (_integral_budget(budget) is not None
+            and all(isinstance(cost, int) for cost in costs)
+            and len(costs) * (budget + 1) <= DP_CELL_LIMIT):
+        return "numpy"
+    return "bnb"
+
+def solve(items, budget, method="auto"):
+    """
+    Єдина точка входу для задачі вибору страв. method:
+      "greedy"  – жадібний (швидкий, але не завжди оптимальний),
+      "dp"      – dynamic_programming, "dp_lean" – економний рядок DP,
+      "numpy"   – векторизований DP, "bnb" – гілки і межі,
+      "mitm"    – зустріч посередині,
+      "auto"    – точний розв'язок найдешевшим способом (див. choose_method).
+    """
+    solvers = {
+        "greedy": greedy_algorithm,
+        "dp": dynamic_programming,
+        "dp_lean": dynamic_programming_lean,
+        "numpy": dynamic_programming_numpy,
+        "bnb": branch_and_bound,
+        "mitm": meet_in_the_middle,
+    }
+    if method == "auto":
+        method = choose_method(items, budget)
+    if method not in solvers:
+        raise ValueError(f"Невідомий метод: {method}")
+    if method in ("dp", "dp_lean", "numpy"):
+        # Табличні методи індексують бюджетом, тож він має бути цілим
+        integral = _integral_budget(budget)
+        if integral is None:
+            raise ValueError(f"Метод {method} потребує цілого бюджету, отримано {budget}")
+        budget = integral
+    return solvers[method](items, budget)
+
+def _split_counts(items, budget, resource=None, limit=None):
+    """
+    Двійкове розбиття кількостей: страва з запасом k ("count" у словнику страви)
+    замінюється частинами 1, 2, 4, ..., залишок – лише O(log k) предметів 0/1,
+    з яких можна скласти будь-яку кількість 0..k.
+    Без ключа "count" страва доступна один раз; count=None означає необмежений
+    запас (фактично – скільки влазить у бюджет і ліміт ресурсу).
+    Повертає частини (назва, кількість, вартість, ресурс, калорійність).
+    """
+    pieces = []
+    for name, info in items.items():
+        cost = info["cost"]
+        amount = info.get(resource, 0) if resource else 0
+        count = info.get("count", 1)
+        if count is None:
+            caps = [budget // cost if cost else None,
+                    limit // amount if resource and amount else None]
+            caps = [cap for cap in caps if cap is not None]
+            if not caps:
+                raise ValueError(f"Необмежена страва {name!r} без вартості й ресурсу")
+            count = min(caps)
+        part = 1
+        while count > 0:
+            take = min(part, count)
+            pieces.append((name, take, take * cost, take * amount, take * info["calories"]))
+            count -= take
+            part *= 2
+    return pieces
+
+def _quantities_result(items, pieces, chosen_pieces, resource=None):
+    """Збирає частини назад у кількості страв; формат як у dynamic_programming + quantities."""
+    quantities = {}
+    for i in chosen_pieces:
+        name, take = pieces[i][0], pieces[i][1]
+        quantities[name] = quantities.get(name, 0) + take
+    # Страви – у порядку меню
+    quantities = {name: quantities[name] for name in items if name in quantities}
+    result = {
+        "chosen_items": list(quantities),
+        "quantities": quantities,
+        "total_cost": sum(items[name]["cost"] * q for name, q in quantities.items()),
+        "total_calories": sum(items[name]["calories"] * q for name, q in quantities.items())
+    }
+    if resource:
+        # Як і в _split_counts, страва без цього ресурсу його не витрачає
+        result[f"total_{resource}"] = sum(items[name].get(resource, 0) * q
+                                          for name, q in quantities.items())
+    return result
+
+def bounded_knapsack(items, budget, workers=1):
+    """
+    Рюкзак з обмеженими (або необмеженими, count=None) кількостями страв
+    через двійкове розбиття та векторизований DP. workers > 1 – паралельно
+    (див. dynamic_programming_2d). Повертає також quantities: назва -> кількість.
+    """
+    pieces = _split_counts(items, budget)
+    if workers > 1:
+        dp, choices = _knapsack_2d_parallel(pieces, budget, 0, workers)
+        return _quantities_result(items, pieces, _backtrack_2d(pieces, choices, budget, 0))
+    item_list = [(i, cost, calories) for i, (_, _, cost, _, calories) in enumerate(pieces)]
+    dp, choices = _knapsack_numpy(item_list, budget)
+    chosen = _backtrack_numpy(item_list, choices, dp, budget)["chosen_items"]
+    return _quantities_result(items, pieces, chosen)
+
+def _knapsack_2d(pieces, budget, limit):
+    """
+    DP з двома обмеженнями: dp[b, l] – максимум калорій при вартості <= b і
+    ресурсі <= l. Кожна частина – один np.maximum над зсунутим 2D-зрізом;
+    рішення зберігаються як np.packbits по осі ресурсу.
+    """
+    integral = all(isinstance(piece[4], int) for piece in pieces)
+    dp = np.zeros((budget + 1, limit + 1), dtype=np.int64 if integral else np.float64)
+    choices = []
+    for _, _, cost, amount, calories in pieces:
+        if cost > budget or amount > limit:
+            choices.append(None)
+            continue
+        candidate = dp[:budget + 1 - cost, :limit + 1 - amount] + calories
+        taken = np.zeros(dp.shape, dtype=bool)
+        np.greater(candidate, dp[cost:, amount:], out=taken[cost:, amount:])
+        np.maximum(dp[cost:, amount:], candidate, out=dp[cost:, amount:])
+        choices.append(np.packbits(taken, axis=1))
+    return dp, choices
+
+# Спільні буфери DP, підключені в робочих процесах (див. _init_dp_worker)
+_DP_SHARED = None
+
+def _init_dp_worker(names, shape, dtype):
+    """Ініціалізатор процесу: один раз підключає обидва буфери DP зі спільної пам'яті."""
+    from multiprocessing import shared_memory
+
+    global _DP_SHARED
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    _DP_SHARED = (blocks, [np.ndarray(shape, dtype=dtype, buffer=b.buf) for b in blocks])
+
+def _dp_rows_worker(src, lo, hi, cost, amount, calories):
+    """
+    Оновлює рядки бюджету lo..hi-1 для однієї частини: читає попередній
+    рядок DP з буфера src, пише в інший буфер. Рядки b залежать лише від
+    рядків b - cost попередньої ітерації, тож діапазони незалежні.
+    Повертає упаковані рішення для своїх рядків.
+    """
+    old, new = _DP_SHARED[1][src], _DP_SHARED[1][1 - src]
+    limit = old.shape[1] - 1
+    new[lo:hi] = old[lo:hi]
+    taken = np.zeros((hi - lo, limit + 1), dtype=bool)
+    start = max(lo, cost)
+    if start < hi:
+        candidate = old[start - cost:hi - cost, :limit + 1 - amount] + calories
+        np.greater(candidate, new[start:hi, amount:], out=taken[start - lo:, amount:])
+        np.maximum(new[start:hi, amount:], candidate, out=new[start:hi, amount:])
+    return np.packbits(taken, axis=1)
+
+def _knapsack_2d_parallel(pieces, budget, limit, workers=None):
+    """
+    Паралельний _knapsack_2d з ідентичним результатом: діапазон бюджету
+    0..budget ділиться на частини між процесами ProcessPoolExecutor; для кожної
+    частини страви процеси оновлюють свої рядки у спільній пам'яті
+    (два буфери – попередня і нова ітерація), а назад передаються лише
+    упаковані біти рішень.
+    """
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    integral = all(isinstance(piece[4], int) for piece in pieces)
+    dtype = np.dtype(np.int64 if integral else np.float64)
+    shape = (budget + 1, limit + 1)
+    size = max(1, shape[0] * shape[1] * dtype.itemsize)
+    blocks = [shared_memory.SharedMemory(create=True, size=size) for _ in range(2)]
+    try:
+        buffers = [np.ndarray(shape, dtype=dtype, buffer=b.buf) for b in blocks]
+        buffers[0].fill(0)
+        chunks = min(budget + 1, workers * 2)
+        bounds = [(budget + 1) * i // chunks for i in range(chunks + 1)]
+        choices = []
+        src = 0
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_dp_worker,
+                                 initargs=([b.name for b in blocks], shape, dtype)) as pool:
+            for _, _, cost, amount, calories in pieces:
+                if cost > budget or amount > limit:
+                    choices.append(None)
+                    continue
+                futures = [pool.submit(_dp_rows_worker, src, lo, hi, cost, amount, calories)
+                           for lo, hi in zip(bounds, bounds[1:])]
+                choices.append(np.concatenate([future.result() for future in futures]))
+                src = 1 - src
+        dp = buffers[src].copy()
+        del buffers
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+    return dp, choices
+
+def _backtrack_2d(pieces, choices, budget, limit):
+    """Відновлює номери взятих частин з бітових матриць _knapsack_2d."""
+    b, l = budget, limit
+    chosen = []
+    for i in range(len(pieces) - 1, -1, -1):
+        bits = choices[i]
+        if bits is not None and bits[b, l >> 3] >> (7 - (l & 7)) & 1:
+            chosen.append(i)
+            b -= pieces[i][2]
+            l -= pieces[i][3]
+    return chosen
+
+def dynamic_programming_2d(items, budget, limit, resource="weight", workers=1):
+    """
+    Вибір страв з двома обмеженнями: сумарна вартість <= budget і сумарний
+    ресурс (ключ resource у словнику страви, наприклад вага чи натрій) <= limit.
+    Підтримує кількості "count" (двійкове розбиття). workers > 1 – паралельна
+    оцінка з поділом діапазону бюджету між процесами.
+    """
+    pieces = _split_counts(items, budget, resource, limit)
+    if workers > 1:
+        dp, choices = _knapsack_2d_parallel(pieces, budget, limit, workers)
+    else:
+        dp, choices = _knapsack_2d(pieces, budget, limit)
+    chosen = _backtrack_2d(pieces, choices, budget, limit)
+    return _quantities_result(items, pieces, chosen, resource)
+
+def brute_force(items, budget, limit=None, resource="weight"):
+    """
+    Повний перебір усіх кількостей (для перевірки на малих меню).
+    Повертає максимальну калорійність.
+    """
+    from itertools import product
+
+    names = list(items)
+    ranges = []
+    for name in names:
+        info = items[name]
+        count = info.get("count", 1)
+        if count is None:
+            count = budget // info["cost"] if info["cost"] else limit // info.get(resource, 0)
+        ranges.append(range(count + 1))
+    best = 0
+    for quantities in product(*ranges):
+        cost = sum(items[n]["cost"] * q for n, q in zip(names, quantities))
+        if cost > budget:
+            continue
+        if limit is not None and sum(items[n].get(resource, 0) * q
+                                     for n, q in zip(names, quantities)) > limit:
+            continue
+        best = max(best, sum(items[n]["calories"] * q for n, q in zip(names, quantities)))
+    return best
+
+def check_bounded(trials=200, seed=0):
+    """Звіряє обмежений і двовимірний DP (послідовний і паралельний) з повним перебором."""
+    import random
+
+    rng = random.Random(seed)
+    for trial in range(trials):
+        menu = random_items(rng.randint(1, 4), max_cost=20, max_calories=50, seed=trial)
+        for info in menu.values():
+            info["count"] = rng.choice([1, 2, 3, 5, None])
+            info["weight"] = rng.randint(1, 15)
+        budget, limit = rng.randint(0, 50), rng.randint(0, 40)
+        expected = brute_force(menu, budget)
+        result = bounded_knapsack(menu, budget)
+        assert result["total_calories"] == expected, (trial, result, expected)
+        assert result["total_cost"] <= budget
+        expected = brute_force(menu, budget, limit)
+        result = dynamic_programming_2d(menu, budget, limit)
+        assert result["total_calories"] == expected, (trial, result, expected)
+        assert result["total_cost"] <= budget and result["total_weight"] <= limit
+        if trial % 20 == 0:
+            assert dynamic_programming_2d(menu, budget, limit, workers=2) == result
+            assert bounded_knapsack(menu, budget, workers=2) == bounded_knapsack(menu, budget)
+
+    # Страва без ресурсу (ключа "weight") його не витрачає
+    menu = {"вода": {"cost": 1, "calories": 1},
+            "суп": {"cost": 5, "calories": 40, "weight": 3}}
+    result = dynamic_programming_2d(menu, 10, 3)
+    assert result["total_calories"] == brute_force(menu, 10, 3) == 41
+    assert result["total_weight"] == 3
+    print(f"check_bounded: {trials} випадків збігаються з повним перебором")
+
+def random_items(n, max_cost=100, max_calories=1000, seed=None):
+    """Генерує випадкове меню з n страв (для тестів і бенчмарків)."""
+    import random
+
+    rng = random.Random(seed)
+    return {
+        f"dish-{i}": {"cost": rng.randint(1, max_cost),
+                      "calories": rng.randint(1, max_calories)}
+        for i in range(n)
+    }
+
+def benchmark_memory(cases=((100, 5_000), (200, 10_000))):
+    """Пікова пам'ять (tracemalloc) і час: таблиця проти одного рядка з бітовою матрицею."""
+    import time
+    import tracemalloc
+
+    print(f"{'n':>5} {'бюджет':>8} {'таблиця, МБ':>12} {'с':>6} {'lean, МБ':>9} {'с':>6}")
+    for n, budget in cases:
+        menu = random_items(n, max_cost=budget // 10, seed=n)
+        row = [n, budget]
+        results = []
+        for solver in (dynamic_programming, dynamic_programming_lean):
+            tracemalloc.start()
+            start = time.perf_counter()
+            results.append(solver(menu, budget))
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            row += [peak / 2**20, elapsed]
+        assert results[0] == results[1]
+        print("{:>5} {:>8} {:>12.1f} {:>6.2f} {:>9.1f} {:>6.2f}".format(*row))
+
+def benchmark_numpy(n=1000, budget=100_000, queries=100):
+    """
+    Час NumPy-рушія проти чистого Python (економний рядок, бо таблиця
+    (n+1) x (budget+1) для таких розмірів не вміщується в пам'ять),
+    а також відповідь на queries бюджетів одним проходом проти окремих викликів.
+    """
+    import random
+    import time
+
+    menu = random_items(n, max_cost=budget // 20, seed=n)
+
+    start = time.perf_counter()
+    python_result = dynamic_programming_lean(menu, budget)
+    t_python = time.perf_counter() - start
+
+    start = time.perf_counter()
+    numpy_result = dynamic_programming_numpy(menu, budget)
+    t_numpy = time.perf_counter() - start
+    assert python_result == numpy_result
+    print(f"n={n}, бюджет={budget}: Python {t_python:.2f} с, NumPy {t_numpy:.2f} с "
+          f"(x{t_python / t_numpy:.0f})")
+
+    budgets = random.Random(0).sample(range(budget + 1), queries)
+    start = time.perf_counter()
+    many = dynamic_programming_many(menu, budgets)
+    t_many = time.perf_counter() - start
+    print(f"{queries} бюджетів одним проходом: {t_many:.2f} с "
+          f"(окремими викликами ~{t_numpy * queries:.0f} с)")
+    assert many[0] == dynamic_programming_numpy(menu, budgets[0])
+
+def benchmark_exact():
+    """
+    Точні методи у різних режимах:
+      - малі цілі вартості (DP у перевазі), зокрема з бюджетом-float:
+        цілий (5000.0) іде в DP, дробовий (4999.5) – у гілки і межі,
+      - вартості в копійках з бюджетом у мільйонах (DP непридатний),
+      - великі n з великими вартостями (лише гілки і межі),
+      - сильно корельовані калорійність і вартість (важкі для гілок і меж,
+        тут виграє зустріч посередині).
+    """
+    import time
+
+    cases = [
+        ("малі вартості", 200, 100, 5_000, False, ("numpy", "bnb")),
+        ("бюджет 5000.0", 200, 100, 5_000.0, False, ("auto", "numpy", "bnb")),
+        ("бюджет 4999.5", 200, 100, 4_999.5, False, ("auto", "bnb", "greedy")),
+        ("копійки, n=30", 30, 1_000_000, 10_000_000, False, ("numpy", "bnb", "mitm")),
+        ("копійки, n=2000", 2000, 1_000_000, 500_000_000, False, ("bnb",)),
+        ("корельовані, n=30", 30, 1_000_000, None, True, ("bnb", "mitm")),
+        ("корельовані, n=40", 40, 1_000_000, None, True, ("bnb", "mitm")),
+    ]
+    print(f"{'режим':<18} {'метод':<7} {'auto':<6} {'час, с':>8} {'калорійність':>14}")
+    for label, n, max_cost, budget, correlated, methods in cases:
+        menu = random_items(n, max_cost=max_cost, max_calories=max_cost, seed=n)
+        if correlated:
+            for info in menu.values():
+                info["calories"] = info["cost"] + max_cost // 10
+            # Половина сумарної вартості – найскладніший для перебору бюджет
+            budget = sum(info["cost"] for info in menu.values()) // 2
+        chosen_method = choose_method(menu, budget)
+        values = set()
+        for method in methods:
+            start = time.perf_counter()
+            result = solve(menu, budget, method)
+            elapsed = time.perf_counter() - start
+            if method != "greedy":
+                values.add(result["total_calories"])
+            print(f"{label:<18} {method:<7} {chosen_method:<6} {elapsed:>8.3f} "
+                  f"{result['total_calories']:>14}")
+        assert len(values) == 1
+
+def benchmark_scaling(workers=None):
+    """
+    Масштабування:
+      - кількість предметів 0/1 після двійкового розбиття проти наївного
+        розгортання запасу k у k копій;
+      - час двовимірного DP від розміру budget x limit, послідовно і в пулі процесів.
+    """
+    import os
+    import time
+
+    if workers is None:
+        workers = max(2, os.cpu_count() or 1)
+    for count in (10, 1_000, 100_000):
+        menu = {"dish": {"cost": 1, "calories": 1, "count": count}}
+        print(f"запас {count:>7}: {len(_split_counts(menu, count)):>3} частин замість {count}")
+
+    menu = random_items(50, max_cost=200, seed=50)
+    for info in menu.values():
+        info["count"] = 3
+        info["weight"] = info["cost"] // 2 + 1
+    print(f"{'бюджет x ліміт':>16} {'1 процес, с':>12} {f'{workers} процесів, с':>14}")
+    for budget, limit in ((500, 250), (1_000, 500), (2_000, 1_000)):
+        start = time.perf_counter()
+        serial = dynamic_programming_2d(menu, budget, limit)
+        t_serial = time.perf_counter() - start
+        start = time.perf_counter()
+        parallel = dynamic_programming_2d(menu, budget, limit, workers=workers)
+        t_parallel = time.perf_counter() - start
+        assert serial == parallel
+        print(f"{f'{budget} x {limit}':>16} {t_serial:>12.2f} {t_parallel:>14.2f}")
+
 # Приклад використання
 if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark_memory()
+        benchmark_numpy()
+        benchmark_exact()
+        benchmark_scaling()
+        sys.exit()
+    if "--check" in sys.argv:
+        check_bounded()
+        sys.exit()
+
     budget = 100  # встановлений бюджет
 
     print("Жадібний алгоритм:")
@@ -103,3 +802,13 @@ if __name__ == "__main__":
     print("Обрані страви:", dp_result["chosen_items"])
     print("Загальна вартість:", dp_result["total_cost"])
     print("Загальна калорійність:", dp_result["total_calories"])
+
+    # Обмежені запаси і друге обмеження (вага, г)
+    stock = {name: dict(info, count=2, weight=info["calories"] // 2)
+             for name, info in items.items()}
+    print("\nЗапас по 2 шт., вага <= 400 г:")
+    limited = dynamic_programming_2d(stock, budget, 400)
+    print("Кількості:", limited["quantities"])
+    print("Загальна вартість:", limited["total_cost"])
+    print("Загальна вага:", limited["total_weight"])
+    print("Загальна калорійність:", limited["total_calories"])
@@ -1,60 +1,142 @@
 import random
+import sys
+
+import numpy as np
 import matplotlib.pyplot as plt
 
 # Кількість кидків кубиків
 num_rolls = 1_000_000
 
-# Ініціалізація лічильників для сум від 2 до 12
-counts = {total: 0 for total in range(2, 13)}
-
-# Симуляція кидків двох кубиків
-for _ in range(num_rolls):
-    die1 = random.randint(1, 6)
-    die2 = random.randint(1, 6)
-    total = die1 + die2
-    counts[total] += 1
-
-# Обчислення симуляційної ймовірності для кожної суми
-simulated_probabilities = {total: counts[total] / num_rolls for total in counts}
-
-# Аналітичні (теоретичні) ймовірності для суми при киданні двох кубиків
-# Формула: кількість сприятливих випадків / 36
-theoretical_probabilities = {
-    2: 1/36,
-    3: 2/36,
-    4: 3/36,
-    5: 4/36,
-    6: 5/36,
-    7: 6/36,
-    8: 5/36,
-    9: 4/36,
-    10: 3/36,
-    11: 2/36,
-    12: 1/36
-}
-
-# Виведення таблиці результатів
-print("Сума\tСимуляційна ймовірність\tАналітична ймовірність")
-for total in range(2, 13):
-    sim_prob = simulated_probabilities[total]
-    theo_prob = theoretical_probabilities[total]
-    print(f"{total}\t{sim_prob:.4f}\t\t\t{theo_prob:.4f}")
-
-# Побудова графіка для порівняння ймовірностей
-sums = list(range(2, 13))
-sim_values = [simulated_probabilities[total] for total in sums]
-theo_values = [theoretical_probabilities[total] for total in sums]
-
-plt.figure(figsize=(10, 6))
-# Будуємо стовпчикові діаграми: зсунути один набір стовпчиків відносно іншого
-width = 0.35
-plt.bar([s - width/2 for s in sums], sim_values, width=width, label='Симуляційна', alpha=0.8)
-plt.bar([s + width/2 for s in sums], theo_values, width=width, label='Аналітична', alpha=0.8)
-
-plt.xlabel('Сума чисел на кубиках')
-plt.ylabel('Ймовірність')
-plt.title('Порівняння симуляційної та аналітичної ймовірностей при киданні двох кубиків')
-plt.xticks(sums)
-plt.legend()
-plt.grid(axis='y', linestyle='--', alpha=0.7)
-plt.show()
+def simulate_loop(num_rolls):
+    """
+    Початкова симуляція: кидки двох кубиків у циклі Python через random.randint.
+    Повертає словник сума -> кількість випадінь (еталон для benchmark).
+    """
+    # Ініціалізація лічильників для сум від 2 до 12
+    counts = {total: 0 for total in range(2, 13)}
+
+    # Симуляція кидків двох кубиків
+    for _ in range(num_rolls):
+        die1 = random.randint(1, 6)
+        die2 = random.randint(1, 6)
+        total = die1 + die2
+        counts[total] += 1
+    return counts
+
+def simulate_dice(num_rolls, dice=2, faces=6, rng=None, chunk_size=1_000_000):
+    """
+    Векторизована симуляція кидків dice кубиків з faces гранями.
+      - кидки генеруються порціями по chunk_size, тож пам'ять стала
+        (O(chunk_size)) навіть для 10^9 кидків;
+      - суми порції рахуються np.bincount і додаються до лічильників;
+      - rng – numpy.random.Generator або seed для відтворюваності.
+    Повертає словник сума -> кількість випадінь для сум dice..dice*faces.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size має бути додатним")
+    if dice < 1 or faces < 1:
+        raise ValueError("dice і faces мають бути додатними")
+    rng = np.random.default_rng(rng)
+    max_total = dice * faces
+    # Найменший тип, у який влазить сума (менше пам'яті та швидше додавання)
+    dtype = np.uint8 if max_total < 2**8 else np.uint16 if max_total < 2**16 else np.int64
+    counts = np.zeros(max_total + 1, dtype=np.int64)
+    totals = np.empty(chunk_size, dtype=dtype)
+    remaining = num_rolls
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        chunk = totals[:size]
+        # Грані 0..faces-1; зсув на dice додається до індексу суми наприкінці
+        chunk[:] = rng.integers(0, faces, size=size, dtype=dtype)
+        for _ in range(dice - 1):
+            chunk += rng.integers(0, faces, size=size, dtype=dtype)
+        counts[:max_total - dice + 1] += np.bincount(chunk, minlength=max_total - dice + 1)
+        remaining -= size
+    return {total: int(counts[total - dice]) for total in range(dice, max_total + 1)}
+
+def theoretical_probabilities(dice=2, faces=6):
+    """
+    Аналітичні ймовірності сум: розподіл суми dice кубиків – це dice-кратна
+    згортка рівномірного розподілу однієї грані (для двох кубиків – k/36).
+    """
+    distribution = np.ones(1)
+    for _ in range(dice):
+        distribution = np.convolve(distribution, np.ones(faces))
+    distribution /= faces ** dice
+    return {dice + i: float(p) for i, p in enumerate(distribution)}
+
+def print_table(simulated_probabilities, theoretical_probabilities):
+    """Виведення таблиці результатів."""
+    print("Сума\tСимуляційна ймовірність\tАналітична ймовірність")
+    for total in simulated_probabilities:
+        sim_prob = simulated_probabilities[total]
+        theo_prob = theoretical_probabilities[total]
+        print(f"{total}\t{sim_prob:.4f}\t\t\t{theo_prob:.4f}")
+
+def plot_probabilities(simulated_probabilities, theoretical_probabilities, dice=2):
+    """Побудова графіка для порівняння ймовірностей."""
+    sums = list(simulated_probabilities)
+    sim_values = [simulated_probabilities[total] for total in sums]
+    theo_values = [theoretical_probabilities[total] for total in sums]
+
+    plt.figure(figsize=(10, 6))
+    # Будуємо стовпчикові діаграми: зсунути один набір стовпчиків відносно іншого
+    width = 0.35
+    plt.bar([s - width/2 for s in sums], sim_values, width=width, label='Симуляційна', alpha=0.8)
+    plt.bar([s + width/2 for s in sums], theo_values, width=width, label='Аналітична', alpha=0.8)
+
+    plt.xlabel('Сума чисел на кубиках')
+    plt.ylabel('Ймовірність')
+    if dice == 2:
+        plt.title('Порівняння симуляційної та аналітичної ймовірностей при киданні двох кубиків')
+    else:
+        plt.title(f'Порівняння симуляційної та аналітичної ймовірностей ({dice} кубиків)')
+    plt.xticks(sums)
+    plt.legend()
+    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    plt.show()
+
+def benchmark(num_rolls=1_000_000, big_rolls=(10**7, 10**8)):
+    """
+    Час циклу Python проти векторизованої симуляції на num_rolls кидках,
+    а також час і пікова пам'ять (tracemalloc) для більших кількостей кидків –
+    пам'ять не росте разом з кількістю кидків.
+    """
+    import time
+    import tracemalloc
+
+    start = time.perf_counter()
+    simulate_loop(num_rolls)
+    t_loop = time.perf_counter() - start
+    start = time.perf_counter()
+    simulate_dice(num_rolls, rng=0)
+    t_numpy = time.perf_counter() - start
+    print(f"{num_rolls} кидків: цикл {t_loop:.2f} с, NumPy {t_numpy * 1000:.1f} мс "
+          f"(x{t_loop / t_numpy:.0f})")
+
+    for rolls in big_rolls:
+        tracemalloc.start()
+        start = time.perf_counter()
+        simulate_dice(rolls, rng=0)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{rolls:>12} кидків: {elapsed:.2f} с, пікова пам'ять {peak / 2**20:.1f} МБ")
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark()
+        sys.exit()
+
+    # Симуляція кидків двох кубиків (seed – для відтворюваності)
+    counts = simulate_dice(num_rolls, dice=2, faces=6, rng=42)
+
+    # Обчислення симуляційної ймовірності для кожної суми
+    simulated_probabilities = {total: counts[total] / num_rolls for total in counts}
+
+    # Аналітичні (теоретичні) ймовірності для суми при киданні двох кубиків
+    # Формула: кількість сприятливих випадків / 36
+    theoretical = theoretical_probabilities(dice=2, faces=6)
+
+    print_table(simulated_probabilities, theoretical)
+    plot_probabilities(simulated_probabilities, theoretical)